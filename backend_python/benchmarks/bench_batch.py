@@ -0,0 +1,37 @@
+"""Portfolio rescoring: one /get-score call per customer vs one /get-score-batch.
+
+Run from backend_python/:  python -m benchmarks.bench_batch
+"""
+import time
+
+import main
+from benchmarks.synthetic import make_statement
+
+PORTFOLIOS = [10, 100, 1000]
+TXNS_PER_CUSTOMER = 120
+
+
+def main_bench():
+    print(f"{'customers':>9} {'per-customer s':>15} {'batch s':>8} {'speedup':>8}")
+    for n in PORTFOLIOS:
+        statements = [
+            main.CustomerStatement(customer_id=f"C{i:05d}",
+                                   transactions=make_statement(TXNS_PER_CUSTOMER, seed=i))
+            for i in range(n)
+        ]
+        main.category_cache.clear()
+        t0 = time.perf_counter()
+        singles = [main.score_statements([s.transactions])[0] for s in statements]
+        t_single = time.perf_counter() - t0
+
+        main.category_cache.clear()
+        t0 = time.perf_counter()
+        batch = main.score_statements([s.transactions for s in statements])
+        t_batch = time.perf_counter() - t0
+
+        assert batch == singles
+        print(f"{n:>9} {t_single:>15.2f} {t_batch:>8.2f} {t_single / t_batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,76 @@
+"""Categorization latency vs statement size.
+
+Run from backend_python/:  python -m benchmarks.bench_categorize
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+import main
+from category_cache import CACHE_SIG_DIGITS
+from benchmarks.synthetic import make_statement
+
+SIZES = [50, 200, 800, 2000]
+REPEATS = 3
+
+
+def rowwise_categorize(df, freq_map, nlp_model):
+    # The previous per-row path: one predict_proba per keyword miss.
+    def predict(row):
+        desc = main.normalize_descriptions(pd.Series([row['description']]))[0]
+        for cat, keywords in main.keyword_matcher.rules.items():
+            if any(k in desc for k in keywords):
+                return cat, 1.0
+        features = pd.DataFrame([[row['description'], row['amount'], freq_map[row['description']]]],
+                                columns=['text', 'amount', 'freq'])
+        probs = nlp_model.predict_proba(features)[0]
+        idx = np.argmax(probs)
+        return nlp_model.classes_[idx], probs[idx]
+
+    results = df.apply(predict, axis=1)
+    return [r[0] for r in results], [r[1] for r in results]
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main_bench():
+    nlp_model = main.model_registry.current().nlp_model
+    if nlp_model is None:
+        raise SystemExit("credit_brain.pkl not loaded; run from backend_python/")
+    print(f"{'rows':>6} {'row-wise ms':>12} {'batched ms':>11} {'warm ms':>8} {'speedup':>8} {'score ms':>14}")
+    for n in SIZES:
+        txns = [main.Transaction(**t) for t in make_statement(n)]
+        df = pd.DataFrame([t.model_dump() for t in txns])
+        freq_map = df['description'].value_counts().to_dict()
+        freqs = df['description'].map(freq_map).to_numpy()
+
+        t_row, (row_cats, row_confs) = best_of(lambda: rowwise_categorize(df, freq_map, nlp_model), repeats=1)
+
+        def cold():
+            main.category_cache.clear()
+            return main.categorize_transactions(df, freqs, nlp_model)
+
+        t_batch, (cats, confs) = best_of(cold)
+        t_warm, (warm_cats, warm_confs) = best_of(lambda: main.categorize_transactions(df, freqs, nlp_model))
+        assert list(cats) == row_cats and list(warm_cats) == row_cats, "batched labels diverged"
+        # Opting in to BHARATCRED_CATEGORY_CACHE_SIG_DIGITS feeds the model rounded
+        # values, so only then may confidences differ from the per-row path
+        if CACHE_SIG_DIGITS is None:
+            assert list(confs) == row_confs and list(warm_confs) == row_confs, "batched confidences diverged"
+        t_score, _ = best_of(lambda: main.score_statements([txns]))
+
+        print(f"{n:>6} {t_row * 1e3:>12.1f} {t_batch * 1e3:>11.1f} {t_warm * 1e3:>8.1f} "
+              f"{t_row / t_batch:>7.0f}x {t_score * 1e3:>14.1f}")
+    print(main.category_cache.stats())
+
+
+if __name__ == "__main__":
+    main_bench()
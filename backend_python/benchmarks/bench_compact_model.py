@@ -0,0 +1,94 @@
+"""Comparison report: credit_brain.pkl (TF-IDF + RandomForest) vs the distilled credit_brain_compact.npz.
+
+For each model: file size, import and load time plus memory the loaded model
+holds in a fresh process, predict
+latency per batch size, and how often the two agree on synthetic statements,
+both on every row and on the rows the keyword rules leave to the model
+(the only rows the model labels in production).
+
+Run from backend_python/:  python -m benchmarks.bench_compact_model
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_statement, make_upi_statement
+from category_cache import quantize, text_key_fn
+from keyword_engine import KeywordMatcher, normalize_descriptions
+from model_registry import load_artifact
+
+MODELS = {'forest (pkl)': 'credit_brain.pkl', 'compact (npz)': 'credit_brain_compact.npz'}
+BATCHES = [1, 100, 10000]
+
+# Runs in a fresh interpreter so imports and page cache effects count
+LOAD_PROBE = """
+import json, sys, time, tracemalloc, warnings
+warnings.filterwarnings('ignore')
+t0 = time.perf_counter()
+from model_registry import load_artifact
+t1 = time.perf_counter()
+tracemalloc.start()
+model = load_artifact(sys.argv[1], mmap_mode=None)
+t2 = time.perf_counter()
+print(json.dumps({'import_s': t1 - t0, 'load_s': t2 - t1, 'retained_mb': tracemalloc.get_traced_memory()[0] / 2**20}))
+"""
+
+
+def cold_load(path, repeats=3):
+    runs = [json.loads(subprocess.run([sys.executable, '-c', LOAD_PROBE, path], capture_output=True,
+                                      text=True, check=True).stdout) for _ in range(repeats)]
+    return {key: min(r[key] for r in runs) for key in runs[0]}
+
+
+def evaluation_rows(text_key):
+    txns = sum((make_upi_statement(1000, seed=s) for s in range(20)), []) + make_statement(5000, seed=3)
+    frame = pd.DataFrame(txns)
+    freq = frame.groupby('description')['description'].transform('size').to_numpy()
+    matcher = KeywordMatcher.from_file('keyword_rules.csv')
+    missed = np.asarray(pd.isna(matcher.match(normalize_descriptions(frame['description']))))
+    # Exactly what predict_cached hands the model
+    X = pd.DataFrame({'text': [text_key(d) for d in frame['description']],
+                      'amount': quantize(frame['amount'].to_numpy()), 'freq': quantize(freq)})
+    return X, missed
+
+
+def predict_ms(model, X, n, repeats=5):
+    batch = X.iloc[:n]
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        model.predict_proba(batch)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1e3
+
+
+def main_bench():
+    missing = [path for path in MODELS.values() if not os.path.exists(path)]
+    if missing:
+        raise SystemExit(f"{missing} not found; run from backend_python/ (python compact_model.py builds the npz)")
+    models = {name: load_artifact(path) for name, path in MODELS.items()}
+    reference = models['forest (pkl)']
+    X, missed = evaluation_rows(text_key_fn(reference))
+    expected = reference.predict(X)
+
+    print(f"{len(X)} evaluation rows, {missed.sum()} not matched by keyword rules")
+    print(f"{'model':>14} {'size KB':>8} {'import ms':>9} {'load ms':>8} {'model MB':>8} "
+          + ' '.join(f"{f'{n} rows ms':>12}" for n in BATCHES) + f" {'agree all':>10} {'agree model':>12}")
+    for name, model in models.items():
+        path = MODELS[name]
+        load = cold_load(path)
+        labels = model.classes_[model.predict_proba(X).argmax(axis=1)]
+        agree = labels == expected
+        print(f"{name:>14} {os.path.getsize(path) / 1024:>8.0f} {load['import_s'] * 1e3:>9.0f} "
+              f"{load['load_s'] * 1e3:>8.1f} {load['retained_mb']:>8.2f} "
+              + ' '.join(f"{predict_ms(model, X, n):>12.2f}" for n in BATCHES)
+              + f" {agree.mean():>10.2%} {agree[missed].mean():>12.2%}")
+
+
+if __name__ == "__main__":
+    main_bench()
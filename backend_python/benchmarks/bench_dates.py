@@ -0,0 +1,68 @@
+"""Date stage: strict ISO + format='mixed' vs dominant-format inference with a cache.
+
+Run from backend_python/:  python -m benchmarks.bench_dates
+"""
+import random
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from date_parser import date_cache, parse_dates
+
+SIZES = [50, 500, 5000, 50000]
+# What the PDF parser actually hands us: mostly one day-first layout per
+# statement, some ISO from the JSON path, and the odd free-form string
+MIXES = {
+    'dd/mm/yyyy': [('%d/%m/%Y', 0.95), ('%Y-%m-%d', 0.05)],
+    'dd Mon yyyy': [('%d %b %Y', 0.9), ('%d/%m/%Y', 0.1)],
+    'iso + junk': [('%Y-%m-%d', 0.8), ('%d-%m-%Y', 0.15), ('%d %B, %Y', 0.05)],
+}
+
+
+def mixed_parse(raw):
+    # The previous date stage
+    raw_dates = raw.astype(str).str.strip()
+    iso_mask = raw_dates.str.match(r'^\d{4}-\d{2}-\d{2}$')
+    parsed = pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns]')
+    parsed.loc[iso_mask] = pd.to_datetime(raw_dates.loc[iso_mask], format='%Y-%m-%d', errors='coerce')
+    parsed.loc[~iso_mask] = pd.to_datetime(raw_dates.loc[~iso_mask], format='mixed', dayfirst=True, errors='coerce')
+    return parsed
+
+
+def make_dates(n, mix, seed=0):
+    rng = random.Random(seed)
+    formats, weights = zip(*mix)
+    start = date(2023, 4, 1)
+    return pd.Series([(start + timedelta(days=rng.randrange(730))).strftime(rng.choices(formats, weights)[0])
+                      for _ in range(n)])
+
+
+def timed(fn, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def cold_parse(raw):
+    date_cache.clear()
+    return parse_dates(raw)
+
+
+def main_bench():
+    print(f"{'mix':>12} {'rows':>6} {'mixed ms':>9} {'cold ms':>8} {'warm ms':>8}")
+    for name, mix in MIXES.items():
+        for n in SIZES:
+            raw = make_dates(n, mix)
+            t_old, old = timed(lambda: mixed_parse(raw), repeats=1 if n > 5000 else 5)
+            t_cold, new = timed(lambda: cold_parse(raw))
+            t_warm, _ = timed(lambda: parse_dates(raw))
+            assert old.equals(new), "parsed dates diverged"
+            print(f"{name:>12} {n:>6} {t_old * 1e3:>9.1f} {t_cold * 1e3:>8.1f} {t_warm * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,65 @@
+"""Feature-stage time and peak memory: repeated boolean filters vs one grouping pass.
+
+Run from backend_python/:  python -m benchmarks.bench_features
+"""
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import main
+from benchmarks.synthetic import make_statement
+from features import NO_MONTH, aggregate_features
+
+SIZES = [500, 5000, 50000]
+
+
+def filtered_features(df):
+    # The previous feature stage: one filtered copy of the frame per total.
+    valid_months = df[df['month'] != NO_MONTH]['month'].nunique()
+    total_income = df[(df['cat'] == 'Income') & (df['amount'] > 0)]['amount'].sum()
+    essential = df[df['cat'] == 'Essential']['amount'].abs().sum()
+    leisure = df[df['cat'] == 'Leisure']['amount'].abs().sum()
+    risky = df[df['cat'] == 'Risky']['amount'].abs().sum()
+    cash = df[df['description'].str.contains('ATM|CASH|WITHDRAWAL', case=False)]['amount'].abs().sum()
+    investment = df[df['cat'] == 'Investment']['amount'].abs().sum()
+    df[df['cat'] == 'Leisure']['amount'].abs().sum()
+    df[df['cat'] == 'Essential']['amount'].abs().sum()
+    dist = df['cat'].value_counts().to_dict()
+    return (total_income, essential, leisure, risky, investment, cash, valid_months, df['conf'].mean(), dist)
+
+
+def measure(fn, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, out
+
+
+def main_bench():
+    print(f"{'rows':>6} {'filters ms':>11} {'filters KiB':>12} {'1-pass ms':>10} {'1-pass KiB':>11}")
+    for n in SIZES:
+        df = pd.DataFrame(make_statement(n))
+        df['customer'] = 0
+        df = main.categorize_frame(df, main.model_registry.current())
+
+        t_old, m_old, old = measure(lambda: filtered_features(df))
+        t_new, m_new, feats = measure(lambda: aggregate_features(df))
+        new = (feats.total_income[0], feats.essential_spend[0], feats.leisure_spend[0],
+               feats.risky_spend[0], feats.investment_spend[0], feats.cash_withdrawn[0],
+               feats.valid_months[0], feats.conf_mean[0], feats.category_distribution[0])
+        # Totals are now exactly-rounded sums, so they may differ from plain float sums in the last bit
+        assert all(np.allclose(a, b, rtol=1e-12, atol=0) if not isinstance(a, dict) else a == b
+                   for a, b in zip(old, new))
+        print(f"{n:>6} {t_old * 1e3:>11.2f} {m_old / 1024:>12.0f} {t_new * 1e3:>10.2f} {m_new / 1024:>11.0f}")
+
+
+if __name__ == "__main__":
+    main_bench()
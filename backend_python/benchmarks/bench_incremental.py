@@ -0,0 +1,41 @@
+"""Incremental scoring vs a full recompute as a customer's history grows.
+
+Feeds a long UPI history month by month through score_incremental and times
+each call next to score_statements on the whole history so far; the payloads
+must match.
+
+Run from backend_python/:  python -m benchmarks.bench_incremental
+"""
+import os
+import tempfile
+import time
+
+import main
+from benchmarks.synthetic import make_upi_statement
+
+MONTHS = 24
+ROWS_PER_MONTH = 400
+
+
+def main_bench():
+    main.model_registry.load()
+    main.feature_store.path = os.path.join(tempfile.mkdtemp(), 'bench_state.sqlite3')
+    history = [main.Transaction(**t) for t in make_upi_statement(MONTHS * ROWS_PER_MONTH, seed=11)]
+    print(f"{'rows so far':>11} {'incremental ms':>15} {'full ms':>8}")
+    for month in range(MONTHS):
+        new = history[month * ROWS_PER_MONTH:(month + 1) * ROWS_PER_MONTH]
+        t0 = time.perf_counter()
+        payload, _ = main.score_incremental('bench', main.statement_columns([new]), month + 1)
+        t_incremental = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        full = main.score_statements([history[:(month + 1) * ROWS_PER_MONTH]])[0]
+        t_full = time.perf_counter() - t0
+        seen = payload.pop('transactions_seen')
+        assert payload.pop('batch_applied') and payload.pop('batch_seq') == month + 1
+        assert payload == full, f"incremental payload differs after {seen} rows"
+        if month % 4 == 3 or month == 0:
+            print(f"{seen:>11} {t_incremental * 1e3:>15.1f} {t_full * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,81 @@
+"""Ingest cost: JSON row list through pydantic vs columnar JSON / CSV / Arrow bodies.
+
+Times body -> validated DataFrame only (no scoring), plus the tracemalloc peak.
+
+Run from backend_python/:  python -m benchmarks.bench_ingest
+"""
+import csv
+import io
+import json
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import TypeAdapter
+
+import main
+from benchmarks.synthetic import make_upi_statement
+from columnar import parse_columns
+
+SIZES = [500, 5000, 50000]
+ROWS = TypeAdapter(List[main.Transaction])
+
+
+def bodies(txns):
+    cols = {k: [t[k] for t in txns] for k in ('description', 'amount', 'date')}
+    out = {'rows json': (json.dumps(txns).encode(), None),
+           'columnar json': (json.dumps(cols).encode(), 'application/json')}
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(['description', 'amount', 'date'])
+    writer.writerows(zip(cols['description'], cols['amount'], cols['date']))
+    out['csv'] = (buf.getvalue().encode(), 'text/csv')
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return out
+    table = pa.table(cols)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    out['arrow'] = (sink.getvalue().to_pybytes(), 'application/vnd.apache.arrow.stream')
+    return out
+
+
+def ingest(body, content_type):
+    if content_type is None:
+        columns = main.statement_columns([ROWS.validate_json(body)])
+    else:
+        columns = parse_columns(body, content_type)
+    return main.frame_from_columns(columns)
+
+
+def measure(fn, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    del out
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main_bench():
+    print(f"{'rows':>6} {'format':>14} {'ms':>8} {'peak MB':>8}")
+    for n in SIZES:
+        reference = None
+        for name, (body, content_type) in bodies(make_upi_statement(n)).items():
+            frame = ingest(body, content_type)
+            if reference is None:
+                reference = frame
+            assert frame.equals(reference), f"{name} built a different frame"
+            t, peak = measure(lambda: ingest(body, content_type))
+            print(f"{n:>6} {name:>14} {t * 1e3:>8.1f} {peak / 2**20:>8.1f}")
+
+
+if __name__ == "__main__":
+    main_bench()
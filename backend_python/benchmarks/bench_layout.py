@@ -0,0 +1,76 @@
+"""Bytes held per transaction by a categorized frame: compact layout vs plain columns.
+
+The compact layout is what categorize_frame leaves (see features.py):
+description ids into the distinct descriptions, int8 category codes, an
+int32 month index and int32 customer. The plain layout is the same rows the
+way the pipeline used to hold them: description strings, datetime64 dates,
+int64 customer, category names as Python objects. Shared Python objects are
+counted once, so the numbers are what the process actually holds.
+
+Two statement shapes: a merchant statement whose descriptions repeat, and a
+UPI statement where most descriptions carry a unique reference number. The
+fixed-width columns shrink alike in both; the UPI text itself cannot.
+
+Run from backend_python/:  python -m benchmarks.bench_layout
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import main
+from benchmarks.synthetic import make_statement, make_upi_statement
+from date_parser import parse_dates
+from features import aggregate_features
+
+SIZES = [10_000, 100_000, 400_000]
+SHAPES = {'merchant': make_statement, 'upi': make_upi_statement}
+
+
+def held_bytes(values) -> int:
+    """Buffer bytes plus every distinct Python object referenced, each counted once."""
+    if isinstance(values, pd.Categorical):
+        return values.codes.nbytes + held_bytes(values.categories.array)
+    if isinstance(values, np.ndarray) and values.dtype == object:
+        distinct = {id(v): v for v in values.tolist()}
+        return values.nbytes + sum(sys.getsizeof(v) for v in distinct.values())
+    return values.nbytes  # numpy buffers, or Arrow-backed strings (offsets plus UTF-8 bytes)
+
+
+def layout_bytes(df: pd.DataFrame) -> dict:
+    return {name: held_bytes(df[name].array if isinstance(df[name].array, (pd.Categorical, pd.arrays.ArrowStringArray))
+                             else df[name].to_numpy())
+            for name in df.columns}
+
+
+def main_bench():
+    models = main.model_registry.current()
+    print(f"{'shape':>8} {'rows':>8} {'plain B/row':>12} {'compact B/row':>14} {'smaller':>8} "
+          f"{'categorize s':>13} {'aggregate s':>12}")
+    for (shape, make), n in ((item, n) for item in SHAPES.items() for n in SIZES):
+        columns = main.statement_columns([[main.Transaction(**t) for t in make(n, seed=n)]])
+        raw = main.frame_from_columns(columns)
+        plain = pd.DataFrame({
+            'description': raw['description'],
+            'amount': raw['amount'],
+            'date': parse_dates(raw['date']),
+            'customer': raw['customer'].astype(np.int64),
+        })
+
+        t0 = time.perf_counter()
+        df = main.categorize_frame(raw.copy(), models)
+        t_categorize = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        aggregate_features(df)
+        t_aggregate = time.perf_counter() - t0
+
+        plain['cat'] = np.asarray(df['cat'], dtype=object)
+        plain['conf'] = df['conf'].to_numpy(dtype=float)
+        wide, compact = sum(layout_bytes(plain).values()), sum(layout_bytes(df).values())
+        print(f"{shape:>8} {n:>8} {wide / n:>12.1f} {compact / n:>14.1f} {wide / compact:>7.1f}x "
+              f"{t_categorize:>13.2f} {t_aggregate:>12.3f}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,63 @@
+"""PD -> score -> capacity: per-customer sklearn calls vs the compiled numpy scorer.
+
+Run from backend_python/:  python -m benchmarks.bench_scorer
+"""
+import math
+import time
+
+import numpy as np
+
+import main
+from scoring import compile_pd_model, score_ratios
+
+SIZES = [1, 100, 10_000, 100_000]
+
+
+def scalar_score(pd_model, avg_monthly_income, savings_rate, risky_ratio, cash_ratio):
+    # The original per-customer chain from main.py
+    prob_default = pd_model.predict_proba(np.array([[savings_rate, risky_ratio]]))[0][1]
+    if cash_ratio > 0.3:
+        prob_default = min(1.0, prob_default + (cash_ratio * 0.25))
+    raw_ml_score = 350 + ((1 - prob_default) * 530)
+    if avg_monthly_income > 0:
+        base_mult = 0.45 + (math.log10(avg_monthly_income) / 11)
+        stability_bonus = 0.06 if (risky_ratio == 0 and savings_rate > 0.4 and cash_ratio < 0.2) else 0
+        capacity_multiplier = min(base_mult + stability_bonus, 1.1)
+    else:
+        capacity_multiplier = 0.45
+    return max(300, min(900, int(raw_ml_score * capacity_multiplier)))
+
+
+def random_ratios(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.lognormal(10, 1.5, n) * (rng.random(n) > 0.05),
+            np.maximum(0, rng.uniform(-0.2, 0.8, n)),
+            np.where(rng.random(n) > 0.3, 0.0, rng.uniform(0, 0.5, n)),
+            rng.uniform(0, 0.6, n))
+
+
+def main_bench():
+    pd_model = main.model_registry.current().pd_model
+    if pd_model is None:
+        raise SystemExit("pd_model.pkl not loaded; run from backend_python/")
+    scorer = compile_pd_model(pd_model)
+    print(f"{'customers':>9} {'sklearn us/cust':>16} {'compiled us/cust':>17} {'speedup':>8}")
+    for n in SIZES:
+        inputs = random_ratios(n)
+        loop_n = min(n, 2000)
+        t0 = time.perf_counter()
+        expected = [scalar_score(pd_model, *(v[i] for v in inputs)) for i in range(loop_n)]
+        t_scalar = (time.perf_counter() - t0) / loop_n
+
+        t0 = time.perf_counter()
+        scores = score_ratios(scorer, *inputs)
+        t_compiled = (time.perf_counter() - t0) / n
+
+        reference = pd_model.predict_proba(np.column_stack(inputs[1:3]))[:, 1]
+        assert np.array_equal(scorer.prob_default(inputs[1], inputs[2]), reference), "PD diverged"
+        assert scores['final_score'][:loop_n].tolist() == expected, "final scores diverged"
+        print(f"{n:>9} {t_scalar * 1e6:>16.1f} {t_compiled * 1e6:>17.2f} {t_scalar / t_compiled:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,82 @@
+"""Startup: import time, time to liveness, readiness and first score.
+
+Import time is measured in fresh interpreters, for main.py (pandas,
+scikit-learn, FastAPI, the whole pipeline) and for serve.py, the
+fast-start entry point. Then a server is started per mode and probed every
+20 ms from the moment the process is spawned:
+
+    main             uvicorn main:app: the port opens after models are loaded
+    serve            uvicorn serve:app: binds at once, loads main in the background
+    serve + cache    as serve, loading pickles from a preconverted model cache
+
+live = /health answers 200, ready = /ready answers 200, first score =
+the first /get-score response after that. Each mode runs REPEATS times;
+medians are reported.
+
+Run from backend_python/:  python -m benchmarks.bench_startup
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.load_test import check_port_free, request, wait_ready
+from benchmarks.synthetic import make_statement
+
+REPEATS = 3
+PORT = 8790
+POLL_SECONDS = 0.02
+
+IMPORT_PROBE = "import time; t0 = time.perf_counter(); import {module}; print(time.perf_counter() - t0)"
+
+
+def import_seconds(module):
+    runs = [float(subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(module=module)], capture_output=True,
+                                 text=True, check=True).stdout.split()[-1]) for _ in range(REPEATS)]
+    return statistics.median(runs)
+
+
+def start_once(target, env, body):
+    base = f'http://127.0.0.1:{PORT}'
+    check_port_free(PORT)
+    t0 = time.perf_counter()
+    server = subprocess.Popen([sys.executable, '-m', 'uvicorn', target, '--port', str(PORT), '--log-level', 'warning'],
+                              env=env, stdout=subprocess.DEVNULL)
+    try:
+        wait_ready(server, f'{base}/health', poll_seconds=POLL_SECONDS)
+        live = time.perf_counter() - t0
+        wait_ready(server, f'{base}/ready', poll_seconds=POLL_SECONDS)
+        ready = time.perf_counter() - t0
+        status, _ = request(f'{base}/get-score', body)
+        assert status == 200
+        first_score = time.perf_counter() - t0
+    finally:
+        server.terminate()
+        server.wait()
+    return live, ready, first_score
+
+
+def main_bench():
+    print(f"import main: {import_seconds('main'):.2f}s   import serve: {import_seconds('serve'):.3f}s")
+    body = json.dumps(make_statement(200)).encode()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        subprocess.run([sys.executable, '-m', 'model_cache', '--cache-dir', cache_dir],
+                       check=True, capture_output=True)
+        modes = [
+            ('main', 'main:app', {}),
+            ('serve', 'serve:app', {}),
+            ('serve + cache', 'serve:app', {'BHARATCRED_MODEL_CACHE_DIR': cache_dir}),
+        ]
+        print(f"{'mode':>14} {'live s':>7} {'ready s':>8} {'first score s':>14}")
+        for name, target, extra_env in modes:
+            env = dict(os.environ, BHARATCRED_RESULT_CACHE_SIZE='0', **extra_env)
+            runs = [start_once(target, env, body) for _ in range(REPEATS)]
+            live, ready, first = (statistics.median(r[i] for r in runs) for i in range(3))
+            print(f"{name:>14} {live:>7.2f} {ready:>8.2f} {first:>14.2f}")
+
+
+if __name__ == "__main__":
+    main_bench()
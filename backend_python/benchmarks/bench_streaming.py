@@ -0,0 +1,71 @@
+"""Peak memory and time: whole-array /get-score vs chunked NDJSON /get-score-stream.
+
+Each case runs in a fresh process. It reads a synthetic UPI statement from
+disk the way the route receives it, either the whole JSON array at once or
+NDJSON in 64 KiB pieces, and reports peak RSS above the process baseline
+(imports plus loaded models) and wall time. Both paths must produce the
+same payload.
+
+Run from backend_python/:  python -m benchmarks.bench_streaming
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import make_upi_statement
+
+SIZES = [20_000, 100_000, 400_000]
+READ_BYTES = 1 << 16
+
+PROBE = """
+import json, resource, sys, time, warnings
+warnings.filterwarnings('ignore')
+import main
+models = main.model_registry.current()
+main.score_statements([main.WARMUP_STATEMENT])
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+t0 = time.perf_counter()
+if sys.argv[1] == 'array':
+    with open(sys.argv[2], 'rb') as f:
+        body = f.read()
+    txns = [main.Transaction(**t) for t in json.loads(body)]
+    payload = main.score_statements([txns])[0]
+else:
+    scorer = main.StreamScorer(models)
+    with open(sys.argv[2], 'rb') as f:
+        for data in iter(lambda: f.read(int(sys.argv[3])), b''):
+            scorer.feed(data)
+    payload = scorer.finish()
+seconds = time.perf_counter() - t0
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'seconds': seconds, 'peak_mb': (peak - baseline) / 1024, 'payload': json.dumps(payload, default=str)}))
+"""
+
+
+def run(mode, path):
+    result = subprocess.run([sys.executable, '-c', PROBE, mode, path, str(READ_BYTES)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main_bench():
+    print(f"{'rows':>8} {'MB':>6} {'array s':>8} {'array MB':>9} {'stream s':>9} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            txns = make_upi_statement(n, seed=n)
+            array_path, ndjson_path = os.path.join(tmp, 'statement.json'), os.path.join(tmp, 'statement.ndjson')
+            with open(array_path, 'w') as f:
+                json.dump(txns, f)
+            with open(ndjson_path, 'w') as f:
+                f.writelines(json.dumps(t) + '\n' for t in txns)
+            del txns
+            whole, streamed = run('array', array_path), run('stream', ndjson_path)
+            assert whole['payload'] == streamed['payload']
+            print(f"{n:>8} {os.path.getsize(ndjson_path) / 2**20:>6.1f} {whole['seconds']:>8.2f} "
+                  f"{whole['peak_mb']:>9.0f} {streamed['seconds']:>9.2f} {streamed['peak_mb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,85 @@
+"""Streaming categorizer training: wall time, throughput and peak memory by data size.
+
+Labels synthetic UPI/NEFT statements with the current service (keyword rules
+plus credit_brain.pkl), writes them as CSV and Parquet, then trains both
+artifacts with train_categorizer.train in a fresh process per run. Peak RSS
+should stay flat as rows grow, since only one chunk is ever in memory.
+
+Run from backend_python/:  python -m benchmarks.bench_training
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+import main
+from benchmarks.synthetic import make_portfolio
+
+SIZES = [100_000, 400_000]
+CHUNK_ROWS = 50_000
+POOL_CUSTOMERS = 200
+
+# One training run in a fresh interpreter, so peak RSS belongs to that run alone
+TRAIN_PROBE = """
+import json, resource, sys
+from train_categorizer import train
+target = train([sys.argv[1]], sys.argv[2], chunk_rows=int(sys.argv[3]))
+with open(target + '/metadata.json') as f:
+    meta = json.load(f)
+meta['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps(meta))
+"""
+
+
+def labelled_pool():
+    """Statements labelled exactly as /get-score labels them."""
+    rows = [dict(txn, customer=c['customer_id'])
+            for c in make_portfolio(POOL_CUSTOMERS, txns_per_customer=500) for txn in c['transactions']]
+    df = main.categorize_frame(pd.DataFrame(rows), main.model_registry.current())
+    freq = df.groupby(['customer', 'description'])['description'].transform('size')
+    return pd.DataFrame({'description': df['description'], 'amount': df['amount'], 'freq': freq,
+                         'label': df['cat']})
+
+
+def write(pool, n, path):
+    frame = pd.concat([pool] * -(-n // len(pool)), ignore_index=True).iloc[:n]
+    if path.endswith('.parquet'):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def train_once(path, out_dir):
+    result = subprocess.run([sys.executable, '-c', TRAIN_PROBE, path, out_dir, str(CHUNK_ROWS)],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main_bench():
+    pool = labelled_pool()
+    formats = ['csv']
+    try:
+        import pyarrow  # noqa: F401
+        formats.append('parquet')
+    except ImportError:
+        print("⚠️ pyarrow not installed; skipping Parquet")
+
+    print(f"{'rows':>8} {'format':>7} {'MB':>6} {'train s':>8} {'rows/s':>9} {'read s':>7} {'forest s':>9} "
+          f"{'compact s':>10} {'trees':>6} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            for fmt in formats:
+                path = os.path.join(tmp, f'labelled_{n}.{fmt}')
+                write(pool, n, path)
+                meta = train_once(path, os.path.join(tmp, 'models'))
+                stages = meta['stage_seconds']
+                print(f"{n:>8} {fmt:>7} {os.path.getsize(path) / 2**20:>6.1f} {meta['training_seconds']:>8.1f} "
+                      f"{n / meta['training_seconds']:>9.0f} {stages['read']:>7.1f} {stages['forest']:>9.1f} "
+                      f"{stages['compact']:>10.1f} {meta['params']['n_estimators']:>6} {meta['peak_rss_mb']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,49 @@
+"""What-if score surfaces: one vectorized grid vs one /get-score per grid point.
+
+For one synthetic UPI statement, times score_what_if (categorize once, score
+the whole grid in one score_ratios call) at several grid sizes, and the
+score surface alone. The alternative, re-scoring an edited statement per
+grid point, is estimated from one score_columns call times the point count.
+
+Run from backend_python/:  python -m benchmarks.bench_what_if
+"""
+import time
+
+import numpy as np
+
+import main
+from benchmarks.synthetic import make_upi_statement
+from what_if import RATIOS, score_surface
+
+STATEMENT_ROWS = 2000
+# Multipliers per axis; the grid is their product
+AXIS_LENGTHS = [(1, 1, 1, 1), (5, 5, 2, 2), (10, 10, 5, 2), (10, 10, 10, 10)]
+
+
+def best_of(fn, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main_bench():
+    models = main.model_registry.current()
+    columns = main.statement_columns([[main.Transaction(**t) for t in make_upi_statement(STATEMENT_ROWS)]])
+    t_single, _ = best_of(lambda: main.score_columns(columns))
+    scorer = main.compile_pd_model(models.pd_model)
+    print(f"{STATEMENT_ROWS}-row statement, one /get-score pass: {t_single * 1e3:.1f} ms")
+    print(f"{'points':>7} {'surface ms':>11} {'what-if ms':>11} {'per-point re-score s':>21}")
+    for lengths in AXIS_LENGTHS:
+        scales = {name: np.linspace(0.0, 2.0, n).tolist() if n > 1 else [1.0] for name, n in zip(RATIOS, lengths)}
+        t_request, (result, _) = best_of(lambda: main.score_what_if(columns, scales))
+        base = {name: result['baseline'][name] for name in RATIOS}
+        t_surface, surface = best_of(lambda: score_surface(scorer, base, scales))
+        points = surface['final_score'].size
+        print(f"{points:>7} {t_surface * 1e3:>11.2f} {t_request * 1e3:>11.1f} {t_single * points:>21.1f}")
+
+
+if __name__ == "__main__":
+    main_bench()
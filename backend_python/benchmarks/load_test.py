@@ -0,0 +1,133 @@
+"""Load test: /get-score throughput for different scoring pool sizes.
+
+Starts one uvicorn server per worker count (BHARATCRED_SCORING_WORKERS),
+drives it with concurrent clients and probes /health alongside to show the
+event loop stays responsive while scoring is saturated. Throughput should
+grow with worker processes up to the number of cores.
+
+Run from backend_python/:
+    python -m benchmarks.load_test --workers 0,1,2,4 --concurrency 16 --requests 400
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from benchmarks.synthetic import make_statement
+
+
+def request(url, body=None):
+    req = urllib.request.Request(url, body, {'Content-Type': 'application/json'})
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - t0
+
+
+def check_port_free(port):
+    # Otherwise the new server dies on bind and we would benchmark whatever is listening
+    with socket.socket() as s:
+        if s.connect_ex(('127.0.0.1', port)) == 0:
+            raise SystemExit(f"port {port} is already in use; stop that server or pass --port")
+
+
+def wait_ready(server, url, deadline=180, poll_seconds=0.5):
+    """Seconds until `url` answers 200; fails fast if `server` exits first."""
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"server exited with code {server.returncode} before {url} answered")
+        try:
+            if request(url)[0] == 200:
+                return time.perf_counter() - t0
+        except OSError:
+            pass
+        time.sleep(poll_seconds)
+    server.kill()
+    raise SystemExit(f"{url} never answered 200")
+
+
+def start_server(workers, port, queue, extra_env=None):
+    # The same body is posted over and over; the result cache would answer all
+    # but the first, so it is off unless extra_env turns it back on
+    env = dict(os.environ, BHARATCRED_SCORING_WORKERS=str(workers), BHARATCRED_SCORING_QUEUE=str(queue),
+               BHARATCRED_RESULT_CACHE_SIZE='0')
+    env.update(extra_env or {})
+    check_port_free(port)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'],
+        env=env)
+    wait_ready(server, f'http://127.0.0.1:{port}/ready')
+    return server
+
+
+def run_load(port, body, concurrency, n_requests):
+    url = f'http://127.0.0.1:{port}/get-score'
+    health, done = [], threading.Event()
+
+    def probe():
+        while not done.is_set():
+            health.append(request(f'http://127.0.0.1:{port}/health')[1])
+            time.sleep(0.05)
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as clients:
+        results = list(clients.map(lambda _: request(url, body), range(n_requests)))
+    elapsed = time.perf_counter() - t0
+    done.set()
+    prober.join()
+
+    statuses = np.array([s for s, _ in results])
+    ok = np.array([t for s, t in results if s == 200])
+    return {
+        'ok_per_s': len(ok) / elapsed,
+        'p50_ms': np.percentile(ok, 50) * 1e3 if len(ok) else float('nan'),
+        'p95_ms': np.percentile(ok, 95) * 1e3 if len(ok) else float('nan'),
+        'rejected_429': int((statuses == 429).sum()),
+        'timeout_503': int((statuses == 503).sum()),
+        'health_p95_ms': np.percentile(health, 95) * 1e3 if health else float('nan'),
+    }
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', default='0,1,2,4', help='comma-separated pool sizes (0 = threads)')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--rows', type=int, default=500, help='transactions per statement')
+    parser.add_argument('--queue', type=int, default=32, help='BHARATCRED_SCORING_QUEUE for the server')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    body = json.dumps(make_statement(args.rows)).encode()
+    print(f"{os.cpu_count()} cores, {args.rows} rows/statement, {args.concurrency} clients")
+    print(f"{'workers':>7} {'ok/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'429':>5} {'503':>5} {'/health p95 ms':>15}")
+    for workers in [int(w) for w in args.workers.split(',')]:
+        server = start_server(workers, args.port, args.queue)
+        try:
+            request(f'http://127.0.0.1:{args.port}/get-score', body)
+            r = run_load(args.port, body, args.concurrency, args.requests)
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"{workers:>7} {r['ok_per_s']:>8.1f} {r['p50_ms']:>8.0f} {r['p95_ms']:>8.0f} "
+              f"{r['rejected_429']:>5} {r['timeout_503']:>5} {r['health_p95_ms']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,340 @@
+"""Reproducible benchmark suite for the scoring pipeline, with JSON output.
+
+Scores seeded synthetic UPI/NEFT statements (50, 500, 5k and 50k rows) and
+a 10k-customer portfolio (scored in /get-score-batch sized chunks), both
+in-process and over HTTP against a freshly started server. For each case it
+reports p50/p95/p99 latency, throughput, and per-stage latency and peak RSS.
+Stage timings come from the same StageTimer the server uses. Over HTTP they
+are read from the Server-Timing header.
+
+Run from backend_python/:
+    python -m benchmarks.suite --out bench.json
+    python -m benchmarks.suite --quick --compare bench.json   # exit 1 on regression
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+import numpy as np
+
+import main
+from benchmarks.load_test import start_server
+from benchmarks.synthetic import make_portfolio, make_upi_statement
+from date_parser import date_cache
+from metrics import StageTimer
+
+STATEMENT_SIZES = [50, 500, 5000, 50000]
+PORTFOLIO_CUSTOMERS = 10000
+PORTFOLIO_TXNS = 120
+QUICK_SIZES = [50, 500, 5000]
+QUICK_PORTFOLIO = 1000
+
+
+# ==========================================
+# Memory sampling
+# ==========================================
+PAGE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def rss_bytes(pid='self'):
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE
+    except OSError:
+        # No /proc (macOS): fall back to the lifetime peak of this process
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RssSampler(threading.Thread):
+    """Samples this process's RSS every `interval` seconds as (perf_counter, bytes)."""
+
+    def __init__(self, interval=0.001):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.samples.append((time.perf_counter(), rss_bytes()))
+            time.sleep(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class TracingTimer(StageTimer):
+    """StageTimer that also remembers when each stage ended, to line up RSS samples."""
+
+    def __init__(self):
+        super().__init__()
+        self.marks = [('start', self._mark)]
+
+    def lap(self, stage):
+        super().lap(stage)
+        self.marks.append((stage, self._mark))
+
+
+def stage_peaks(samples, marks):
+    """Peak sampled RSS inside each (previous mark, mark] window, and its growth
+    over the RSS when the stage began."""
+    times = np.array([t for t, _ in samples])
+    rss = np.array([r for _, r in samples])
+    peaks = {}
+    for (_, start), (stage, end) in zip(marks, marks[1:]):
+        before = rss[max(np.searchsorted(times, start) - 1, 0)]
+        window = rss[(times > start) & (times <= end)]
+        # Stages shorter than the sampling interval get the next sample after them
+        value = window.max() if len(window) else rss[min(np.searchsorted(times, end), len(rss) - 1)]
+        peak, growth = peaks.get(stage, (0, 0))
+        peaks[stage] = (max(peak, int(value)), max(growth, int(value - before)))
+    return peaks
+
+
+# ==========================================
+# Cases
+# ==========================================
+def statement_cases(sizes):
+    for n in sizes:
+        yield {'case': f'statement-{n}', 'endpoint': '/get-score', 'transactions': n,
+               'repeats': max(3, min(50, 200000 // n)),
+               'make': lambda rep, n=n: make_upi_statement(n, seed=1000 * n + rep)}
+
+
+def portfolio_case(customers, batch_size):
+    batches = max(1, customers // batch_size)
+    return {'case': f'portfolio-{customers}', 'endpoint': '/get-score-batch',
+            'transactions': batch_size * PORTFOLIO_TXNS, 'customers_per_request': batch_size, 'repeats': batches,
+            'make': lambda rep: make_portfolio(batch_size, PORTFOLIO_TXNS, seed=batch_size * rep)}
+
+
+def summarize(latencies, stage_times, peaks, case, elapsed):
+    ms = np.array(latencies) * 1e3
+    n_requests = len(latencies)
+    result = {
+        'case': case['case'],
+        'transactions_per_request': case['transactions'],
+        'requests': n_requests,
+        'latency_ms': {q: round(float(np.percentile(ms, p)), 3)
+                       for q, p in (('p50', 50), ('p95', 95), ('p99', 99))} | {'mean': round(float(ms.mean()), 3)},
+        'throughput': {'requests_per_s': round(n_requests / elapsed, 3),
+                       'transactions_per_s': round(n_requests * case['transactions'] / elapsed, 1)},
+        'stages': {},
+    }
+    if 'customers_per_request' in case:
+        result['throughput']['customers_per_s'] = round(n_requests * case['customers_per_request'] / elapsed, 1)
+    for stage, values in stage_times.items():
+        v = np.array(values) * 1e3
+        result['stages'][stage] = {q: round(float(np.percentile(v, p)), 3)
+                                   for q, p in (('p50', 50), ('p95', 95), ('p99', 99))}
+        if stage in peaks:
+            peak, growth = peaks[stage]
+            result['stages'][stage]['peak_rss_mb'] = round(peak / 2**20, 1)
+            result['stages'][stage]['rss_growth_mb'] = round(growth / 2**20, 1)
+    return result
+
+
+def run_inprocess(case, cold):
+    warm = case['make'](-1)
+    score_one(case, warm)
+    latencies, stage_times, peaks = [], {}, {}
+    sampler = RssSampler()
+    sampler.start()
+    for rep in range(case['repeats']):
+        payload = case['make'](rep)
+        if cold:
+            main.category_cache.clear()
+            date_cache.clear()
+        t0 = time.perf_counter()
+        timer = score_one(case, payload)
+        latencies.append(time.perf_counter() - t0)
+        for stage, seconds in timer.stages.items():
+            stage_times.setdefault(stage, []).append(seconds)
+        for stage, (peak, growth) in stage_peaks(sampler.samples, timer.marks).items():
+            old_peak, old_growth = peaks.get(stage, (0, 0))
+            peaks[stage] = (max(old_peak, peak), max(old_growth, growth))
+    # Only scoring time counts toward throughput, not building the synthetic input
+    elapsed = sum(latencies)
+    sampler.stop()
+    result = summarize(latencies, stage_times, peaks, case, elapsed)
+    result['peak_rss_mb'] = round(max(r for _, r in sampler.samples) / 2**20, 1)
+    return result
+
+
+def score_one(case, payload):
+    # Same steps as the routes: pydantic validation, column lists, pipeline
+    timer = TracingTimer()
+    if case['endpoint'] == '/get-score':
+        statements = [[main.Transaction(**t) for t in payload]]
+    else:
+        statements = [main.CustomerStatement(**c).transactions for c in payload]
+    columns = main.statement_columns(statements)
+    timer.lap('ingest')
+    main.score_columns(columns, timer)
+    return timer
+
+
+def parse_server_timing(header):
+    stages = {}
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        if params.startswith('dur='):
+            stages[name] = float(params[4:]) / 1e3
+    return stages
+
+
+def post(url, body):
+    req = urllib.request.Request(url, body, {'Content-Type': 'application/json'})
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=600) as resp:
+        resp.read()
+        return time.perf_counter() - t0, parse_server_timing(resp.headers.get('Server-Timing'))
+
+
+def reset_peak_rss(pid):
+    # Writing 5 to clear_refs resets VmHWM (Linux 4.0+), so each case gets its own peak
+    try:
+        with open(f'/proc/{pid}/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def server_peak_rss(pid):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+
+
+def run_http(case, port, server_pid):
+    url = f'http://127.0.0.1:{port}{case["endpoint"]}'
+    post(url, json.dumps(case['make'](-1)).encode())
+    reset_peak_rss(server_pid)
+    latencies, stage_times = [], {}
+    for rep in range(case['repeats']):
+        body = json.dumps(case['make'](rep)).encode()
+        seconds, stages = post(url, body)
+        latencies.append(seconds)
+        for stage, s in stages.items():
+            stage_times.setdefault(stage, []).append(s)
+    result = summarize(latencies, stage_times, {}, case, sum(latencies))
+    peak = server_peak_rss(server_pid)
+    result['peak_rss_mb'] = round(peak / 2**20, 1) if peak else None
+    return result
+
+
+# ==========================================
+# Report + regression check
+# ==========================================
+def environment():
+    import fastapi, pandas, sklearn
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__, 'pandas': pandas.__version__, 'scikit_learn': sklearn.__version__,
+        'fastapi': fastapi.__version__,
+        'model_version': main.model_registry.current().version,
+        'config': {k: v for k, v in os.environ.items() if k.startswith('BHARATCRED_')},
+    }
+
+
+def print_result(mode, r):
+    lat = r['latency_ms']
+    print(f"{mode:>9} {r['case']:>18} {lat['p50']:>9.1f} {lat['p95']:>9.1f} {lat['p99']:>9.1f} "
+          f"{r['throughput']['transactions_per_s']:>12.0f} {r['peak_rss_mb'] or float('nan'):>9.1f}")
+
+
+def compare(baseline, current, tolerance):
+    """Regressions of p50/p95 latency or peak RSS beyond `tolerance`, as printable lines."""
+    old = {(r['mode'], r['case']): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        before = old.get((r['mode'], r['case']))
+        if before is None:
+            continue
+        checks = [(f"latency {q}", before['latency_ms'][q], r['latency_ms'][q]) for q in ('p50', 'p95')]
+        if before.get('peak_rss_mb') and r.get('peak_rss_mb'):
+            checks.append(('peak RSS', before['peak_rss_mb'], r['peak_rss_mb']))
+        for what, a, b in checks:
+            if b > a * (1 + tolerance):
+                regressions.append(f"{r['mode']} {r['case']}: {what} {a:.1f} -> {b:.1f} (+{(b / a - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', default='inprocess,http')
+    parser.add_argument('--sizes', default=None, help='comma-separated statement sizes')
+    parser.add_argument('--portfolio', type=int, default=None, help='customers in the portfolio case (0 to skip)')
+    parser.add_argument('--batch-size', type=int, default=500, help='customers per /get-score-batch request')
+    parser.add_argument('--quick', action='store_true', help=f'sizes {QUICK_SIZES}, {QUICK_PORTFOLIO} customers')
+    parser.add_argument('--cold', action='store_true', help='clear the category and date caches before each run')
+    parser.add_argument('--workers', type=int, default=0, help='BHARATCRED_SCORING_WORKERS for the HTTP server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--out', default=None, help='write results JSON here')
+    parser.add_argument('--compare', default=None, help='baseline JSON; exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else (QUICK_SIZES if args.quick else STATEMENT_SIZES)
+    customers = args.portfolio if args.portfolio is not None else (QUICK_PORTFOLIO if args.quick else PORTFOLIO_CUSTOMERS)
+    cases = list(statement_cases(sizes))
+    if customers:
+        cases.append(portfolio_case(customers, min(args.batch_size, customers)))
+
+    report = {'environment': environment(), 'settings': vars(args), 'results': []}
+    print(f"{'mode':>9} {'case':>18} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'txns/s':>12} {'peak MB':>9}")
+    modes = args.modes.split(',')
+    if 'inprocess' in modes:
+        for case in cases:
+            r = {'mode': 'inprocess', **run_inprocess(case, args.cold)}
+            report['results'].append(r)
+            print_result('inprocess', r)
+    if 'http' in modes:
+        server = start_server(args.workers, args.port, queue=32, extra_env={'BHARATCRED_SERVER_TIMING': '1'})
+        try:
+            for case in cases:
+                r = {'mode': 'http', **run_http(case, args.port, server.pid)}
+                report['results'].append(r)
+                print_result('http', r)
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=1)
+        print(f"wrote {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), report, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main_bench()
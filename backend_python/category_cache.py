@@ -0,0 +1,133 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# ==========================================
+# 1. FEATURE QUANTIZATION
+# ==========================================
+# Unset (the default), the cache keys on the exact amount and frequency and the
+# model sees exactly what it always did. An operator may opt in to rounding both
+# to a few significant figures, so "ZOMATO -452" and "ZOMATO -449" share one
+# entry. The model then always sees the rounded values, which keeps a label a
+# pure function of its key (same score with a warm or cold cache), but that is
+# a change of the model's inputs: confidences, and so payloads, differ from the
+# unrounded model on some statements. Enabling or changing it is a model release.
+CACHE_SIG_DIGITS = int(os.getenv('BHARATCRED_CATEGORY_CACHE_SIG_DIGITS', '0')) or None
+CACHE_MAX_ENTRIES = int(os.getenv('BHARATCRED_CATEGORY_CACHE_SIZE', '50000'))
+
+def quantize(values, sig_digits: Optional[int] = CACHE_SIG_DIGITS) -> np.ndarray:
+    """The amounts or frequencies the model is fed: `values` as floats, rounded if enabled."""
+    values = np.asarray(values, dtype=float)
+    if not sig_digits:
+        return values
+    magnitude = np.floor(np.log10(np.abs(np.where(values == 0, 1, values))))
+    scale = 10.0 ** (sig_digits - 1 - magnitude)
+    return np.round(values * scale) / scale
+
+def text_key_fn(model) -> Callable[[str], str]:
+    """Canonical description text that the model cannot tell apart from the raw one.
+
+    For the TF-IDF pipeline (and the compact model's hashing vectorizer) this is
+    the vectorizer's own lowercase token stream joined by spaces, so "UPI/ZOMATO"
+    and "upi zomato" share a key and still get the exact same text features.
+    Unknown model shapes fall back to the raw text.
+    """
+    try:
+        vectorizer = getattr(model, 'text_vectorizer', None) or \
+            model.named_steps['preprocessor'].named_transformers_['text']
+        preprocess = vectorizer.build_preprocessor()
+        tokenize = vectorizer.build_tokenizer()
+    except (AttributeError, KeyError, TypeError):
+        return str
+    return lambda text: ' '.join(tokenize(preprocess(text)))
+
+# ==========================================
+# 2. PROCESS-WIDE LRU
+# ==========================================
+class CategoryCache:
+    """Bounded LRU of (text, amount, freq) -> (category, confidence).
+
+    Bound to one model object at a time; binding a different model (e.g. when
+    credit_brain.pkl is reloaded) drops every entry. Lookups and inserts made
+    with any other model, such as requests still finishing on the previous
+    generation, bypass the cache instead of mixing generations.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._model = None
+        self.text_key: Callable[[str], str] = str
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def bind_model(self, model) -> None:
+        with self._lock:
+            if self._model is not model:
+                if self._model is not None:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._model = model
+                self.text_key = text_key_fn(model)
+
+    def text_key_for(self, model) -> Callable[[str], str]:
+        return self.text_key if model is self._model else text_key_fn(model)
+
+    def get_many(self, keys: Iterable[Hashable], model) -> List[Optional[Tuple[str, float]]]:
+        found = []
+        with self._lock:
+            if model is not self._model:
+                return [None for _ in keys]
+            for key in keys:
+                value = self._entries.get(key)
+                if value is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                found.append(value)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[Hashable, Tuple[str, float]]], model) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if model is not self._model:
+                return
+            for key, value in items:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+def merge_stats(stats: List[dict]) -> dict:
+    """Totals over several processes' CategoryCache.stats(), e.g. one per scoring worker."""
+    totals = {name: sum(s[name] for s in stats)
+              for name in ('entries', 'max_entries', 'hits', 'misses', 'evictions', 'invalidations')}
+    lookups = totals['hits'] + totals['misses']
+    totals['hit_rate'] = round(totals['hits'] / lookups, 4) if lookups else 0.0
+    return totals
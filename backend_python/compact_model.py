@@ -0,0 +1,171 @@
+"""Compact NLP categorizer: hashing vectorizer + linear model, distilled from credit_brain.pkl.
+
+Drop-in for the TF-IDF + RandomForest pipeline wherever main.py uses it
+(predict_proba on a text/amount/freq frame, classes_). It is saved as a
+plain .npz of arrays, loaded with allow_pickle=False: no code runs at load
+time and there is no vocabulary or tree to rebuild.
+
+Distil from an existing pipeline without retraining it:
+    python compact_model.py [credit_brain.pkl] [credit_brain_compact.npz]
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.special import softmax
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+from category_cache import quantize, text_key_fn
+
+# ==========================================
+# 1. FORMAT
+# ==========================================
+COMPACT_SUFFIX = '.npz'
+FORMAT_VERSION = 1
+# Hashed text columns; collisions only matter between tokens the teacher
+# knows, and there are a few dozen of those
+N_TEXT_FEATURES = 2 ** 16
+NGRAM_RANGE = (1, 2)
+MIN_COLUMN_ROWS = 5
+TEMPERATURES = np.geomspace(0.25, 16, 25)
+SGD_ALPHA = 1e-5
+
+def hashing_vectorizer(n_text_features: int = N_TEXT_FEATURES, ngram_range=NGRAM_RANGE) -> HashingVectorizer:
+    # Stateless: nothing to fit, so training can stream and serving needs no vocabulary
+    return HashingVectorizer(n_features=n_text_features, ngram_range=tuple(ngram_range), alternate_sign=False,
+                             norm='l2')
+
+def numeric_features(amount: np.ndarray, freq: np.ndarray) -> np.ndarray:
+    """Sign and log-magnitude of the amount plus log frequency, on one scale."""
+    amount = np.asarray(amount, dtype=float)
+    sign = np.sign(amount)
+    return np.column_stack([sign, sign * np.log1p(np.abs(amount)), np.log1p(np.asarray(freq, dtype=float))])
+
+# ==========================================
+# 2. MODEL
+# ==========================================
+class CompactCategorizer:
+    """Multinomial linear model over hashed 1-2 grams and three numeric features."""
+
+    def __init__(self, text_coef: np.ndarray, numeric_coef: np.ndarray, intercept: np.ndarray,
+                 classes: np.ndarray, n_text_features: int = N_TEXT_FEATURES, ngram_range=NGRAM_RANGE,
+                 temperature: float = 1.0):
+        self.text_coef = sparse.csr_matrix(text_coef)  # (n_text_features, n_classes), mostly empty rows
+        self.numeric_coef = numeric_coef                # (3, n_classes)
+        self.intercept = intercept                      # (n_classes,)
+        # Softens the logits so confidences track the forest's vote shares
+        self.temperature = float(temperature)
+        self.classes_ = classes.astype(object)
+        # Same lowercase token stream as the TF-IDF pipeline, so
+        # category_cache.text_key_fn gives identical keys for both models
+        self.text_vectorizer = hashing_vectorizer(n_text_features, ngram_range)
+
+    @classmethod
+    def from_linear(cls, clf, rows_per_column: np.ndarray = None) -> 'CompactCategorizer':
+        """Wrap a linear classifier fitted on [hashed text | numeric_features] columns.
+
+        Text columns fewer than MIN_COLUMN_ROWS training rows touched (hash
+        noise, one-off tokens) are dropped, which keeps the file small.
+        """
+        coef = clf.coef_.T.copy()
+        if rows_per_column is not None:
+            coef[:N_TEXT_FEATURES][rows_per_column < MIN_COLUMN_ROWS] = 0.0
+        return cls(coef[:N_TEXT_FEATURES], coef[N_TEXT_FEATURES:], clf.intercept_, clf.classes_)
+
+    def _features(self, X: pd.DataFrame) -> sparse.csr_matrix:
+        return self.text_vectorizer.transform(X['text'])
+
+    def decision_function(self, X: pd.DataFrame) -> np.ndarray:
+        return ((self._features(X) @ self.text_coef).toarray()
+                + numeric_features(X['amount'].to_numpy(), X['freq'].to_numpy()) @ self.numeric_coef
+                + self.intercept)
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        return softmax(self.decision_function(X) / self.temperature, axis=1)
+
+    def predict(self, X: pd.DataFrame) -> np.ndarray:
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
+
+    # ---- persistence ----
+    def save(self, path: str) -> None:
+        # Only the hashed columns the model actually uses go to disk
+        used = np.flatnonzero(np.diff(self.text_coef.indptr)).astype(np.int32)
+        meta = {'format_version': FORMAT_VERSION, 'n_text_features': self.text_vectorizer.n_features,
+                'ngram_range': list(self.text_vectorizer.ngram_range), 'temperature': self.temperature}
+        # Staged then renamed over `path`, so a server polling it never loads half a file
+        staging = f"{path}.{os.getpid()}.staging"
+        with open(staging, 'wb') as f:
+            np.savez(f, text_columns=used, text_coef=self.text_coef[used].toarray(), numeric_coef=self.numeric_coef,
+                     intercept=self.intercept, classes=self.classes_.astype(str), meta=np.array(json.dumps(meta)))
+        os.replace(staging, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CompactCategorizer':
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f['meta']))
+            if meta['format_version'] != FORMAT_VERSION:
+                raise ValueError(f"{path}: compact model format {meta['format_version']}, expected {FORMAT_VERSION}")
+            used, weights = f['text_columns'], f['text_coef']
+            text_coef = sparse.csr_matrix((weights.ravel(), (np.repeat(used, weights.shape[1]),
+                                                             np.tile(np.arange(weights.shape[1]), len(used)))),
+                                          shape=(meta['n_text_features'], weights.shape[1]))
+            return cls(text_coef, f['numeric_coef'], f['intercept'], f['classes'],
+                       meta['n_text_features'], meta['ngram_range'], meta['temperature'])
+
+# ==========================================
+# 3. DISTILLATION
+# ==========================================
+def rows_per_column(text: sparse.csr_matrix) -> np.ndarray:
+    return np.bincount(text.indices, minlength=text.shape[1])
+
+def transfer_set(texts, n_rows: int = 30000, seed: int = 0, text_key=str) -> pd.DataFrame:
+    """Rows for the teacher to label: its own texts, recombined tokens and unknown
+    tokens, over the quantized amount and frequency ranges statements produce."""
+    rng = np.random.default_rng(seed)
+    known = [text_key(t) for t in dict.fromkeys(texts)]
+    vocab = sorted({token for text in known for token in text.split()})
+    rows = []
+    for _ in range(n_rows):
+        tokens = list(rng.choice(vocab, size=rng.integers(0, 4)))
+        tokens += [f"x{rng.integers(10**6)}" for _ in range(rng.integers(0, 3))]
+        if rng.random() < 0.4:
+            tokens = known[rng.integers(len(known))].split() + tokens
+        rows.append(' '.join(tokens))
+    amount = rng.choice([-1.0, 1.0], n_rows) * 10 ** rng.uniform(0, 6, n_rows)
+    freq = rng.integers(1, 80, n_rows)
+    # The values the service feeds the model (rounded only if BHARATCRED_CATEGORY_CACHE_SIG_DIGITS is set)
+    return pd.DataFrame({'text': rows, 'amount': quantize(amount), 'freq': quantize(freq)})
+
+def distill(teacher, texts, n_rows: int = 30000, seed: int = 0) -> CompactCategorizer:
+    """Fit a CompactCategorizer to reproduce `teacher`'s labels."""
+    X = transfer_set(texts, n_rows, seed, text_key_fn(teacher))
+    teacher_probs = teacher.predict_proba(X)
+    y = teacher.classes_[teacher_probs.argmax(axis=1)]
+    text = hashing_vectorizer().transform(X['text'])
+    features = sparse.hstack([text, numeric_features(X['amount'], X['freq'])]).tocsr()
+    clf = SGDClassifier(loss='log_loss', alpha=SGD_ALPHA, max_iter=30, tol=None, random_state=seed)
+    clf.fit(features, y)
+    # Made-up unknown tokens teach the model to ignore text it has never seen;
+    # pruning drops the weight each one leaves on its own hashed column
+    student = CompactCategorizer.from_linear(clf, rows_per_column(text))
+    # Labels are fixed by now (argmax ignores the temperature); pick the one whose
+    # confidences sit closest to the teacher's
+    logits = student.decision_function(X)
+    teacher_conf = teacher_probs.max(axis=1)
+    student.temperature = min(TEMPERATURES, key=lambda t: np.abs(softmax(logits / t, axis=1).max(axis=1)
+                                                                  - teacher_conf).mean())
+    return student
+
+if __name__ == "__main__":
+    import joblib
+    source = sys.argv[1] if len(sys.argv) > 1 else 'credit_brain.pkl'
+    target = sys.argv[2] if len(sys.argv) > 2 else 'credit_brain_compact.npz'
+    teacher = joblib.load(source)
+    # The teacher's own vocabulary stands in for its training texts
+    vocabulary = teacher.named_steps['preprocessor'].named_transformers_['text'].vocabulary_
+    distill(teacher, list(vocabulary)).save(target)
+    print(f"✅ Compact categorizer distilled from {source} -> {target}")
@@ -0,0 +1,134 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 1. FORMATS WE SEE IN STATEMENTS
+# ==========================================
+# ISO strings are always parsed strictly (YYYY-MM-DD) to avoid day/month
+# inversion; an ISO-shaped string that is not a real date stays NaT.
+ISO_FORMAT = '%Y-%m-%d'
+_ISO = re.compile(r'\d{4}-\d{2}-\d{2}$')
+
+# Layouts the PDF parser emits. Each one reads a string exactly as
+# format='mixed', dayfirst=True would (numeric dates are day-first, month-first
+# only appears with a named month), so picking one is only a speed-up.
+DAYFIRST_FORMATS = [
+    '%d/%m/%Y', '%d-%m-%Y', '%d %b %Y', '%d-%b-%Y', '%d %B %Y', '%d %B, %Y',
+    '%d/%m/%y', '%d-%m-%y', '%d %b %y', '%d.%m.%Y', '%b %d, %Y', '%B %d, %Y',
+]
+INFERENCE_SAMPLE = 64
+
+# Cheap shape check per format, so inference never pays for a failing strptime
+_SHAPE_TOKENS = {'%d': r'\d{1,2}', '%m': r'\d{1,2}', '%Y': r'\d{4}', '%y': r'\d{2}',
+                 '%b': r'[A-Za-z]{3}', '%B': r'[A-Za-z]{3,9}'}
+
+def _shape_pattern(fmt: str) -> "re.Pattern":
+    pattern = re.escape(fmt)
+    for token, regex in _SHAPE_TOKENS.items():
+        pattern = pattern.replace(re.escape(token), regex)
+    return re.compile(pattern + '$')
+
+_SHAPES = {fmt: _shape_pattern(fmt) for fmt in DAYFIRST_FORMATS}
+
+DATE_CACHE_SIZE = int(os.getenv('BHARATCRED_DATE_CACHE_SIZE', '4096'))
+
+# ==========================================
+# 2. SEEN-STRING CACHE
+# ==========================================
+class DateCache:
+    """Small LRU of date string -> datetime64[ns], shared across requests."""
+
+    def __init__(self, max_entries: int = DATE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, np.datetime64]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, keys):
+        with self._lock:
+            found = {}
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = value
+            return found
+
+    def store(self, parsed: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries.update(parsed)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+date_cache = DateCache()
+
+# ==========================================
+# 3. PARSER
+# ==========================================
+def infer_format(values: List[str]) -> Optional[str]:
+    """The format whose shape fits most of a sample of `values`, or None."""
+    sample = values[:INFERENCE_SAMPLE]
+    best, best_hits = None, 0
+    for fmt, shape in _SHAPES.items():
+        hits = sum(1 for v in sample if shape.match(v))
+        if hits > best_hits:
+            best, best_hits = fmt, hits
+    return best
+
+def _to_datetime(values: List[str], **kwargs) -> np.ndarray:
+    # The mixed parser can return dates outside the datetime64[ns] range
+    # (e.g. year 1 when no year is present); treat those as unparseable
+    parsed = pd.to_datetime(pd.Index(values, dtype=object), errors='coerce', **kwargs)
+    in_range = (parsed >= pd.Timestamp.min) & (parsed <= pd.Timestamp.max)
+    return parsed.where(in_range).astype('datetime64[ns]').to_numpy()
+
+def _parse_distinct(values: List[str]) -> np.ndarray:
+    parsed = np.full(len(values), np.datetime64('NaT'), dtype='datetime64[ns]')
+    is_iso = np.fromiter((_ISO.match(v) is not None for v in values), dtype=bool, count=len(values))
+    iso_rows = np.flatnonzero(is_iso)
+    if len(iso_rows):
+        parsed[iso_rows] = _to_datetime([values[i] for i in iso_rows], format=ISO_FORMAT)
+
+    # Dominant format first, then the runner-up on what it missed, and so on
+    rest = np.flatnonzero(~is_iso)
+    tried = set()
+    while len(rest):
+        fmt = infer_format([values[i] for i in rest])
+        if fmt is None or fmt in tried:
+            break
+        tried.add(fmt)
+        parsed[rest] = _to_datetime([values[i] for i in rest], format=fmt)
+        rest = rest[np.isnat(parsed[rest])]
+    # Only strings no known format fits go through the slow mixed parser
+    if len(rest):
+        parsed[rest] = _to_datetime([values[i] for i in rest], format='mixed', dayfirst=True)
+    return parsed
+
+def parse_dates(raw: pd.Series) -> pd.Series:
+    """Parse a statement's date column into datetime64[ns] (NaT when unparseable).
+
+    Each distinct string is parsed once: known strings come from the cache, the
+    rest are parsed strictly as ISO or with the statement's dominant day-first
+    format, and only leftovers fall back to format='mixed', dayfirst=True.
+    """
+    codes, distinct = pd.factorize(raw.astype(str).str.strip())
+    distinct = distinct.tolist()
+    known = date_cache.lookup(distinct)
+    todo = [d for d in distinct if d not in known]
+    if todo:
+        fresh = dict(zip(todo, _parse_distinct(todo)))
+        date_cache.store(fresh)
+        known.update(fresh)
+    lookup = np.array([known[d] for d in distinct], dtype='datetime64[ns]')
+    return pd.Series(lookup[codes], index=raw.index)
@@ -0,0 +1,319 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from fractions import Fraction
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from category_cache import quantize
+from features import CASH_PATTERN, BehavioralFeatures
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+FEATURE_STORE_PATH = os.getenv('BHARATCRED_FEATURE_STORE', 'customer_state.sqlite3')
+
+# Non-positive rows the model calls Income count in the distribution but never
+# in total_income, so they keep a bucket of their own (as in aggregate_features)
+NON_POSITIVE_INCOME = 'Income<=0'
+
+# ==========================================
+# 2. PER-CUSTOMER STATE
+# ==========================================
+# A row's category is a pure function of (description, quantized amount,
+# quantized description count), so rows are kept per description as groups
+# of equal quantized amount: [q_amount, raw amount, rows, sum |amount|,
+# first row index, category, confidence]. When a description's quantized
+# count changes, only its groups are re-labelled.
+#
+# Money and confidence sums are kept exact (Fraction; stored as "n/d") and
+# rounded once when read, like the math.fsum totals aggregate_features
+# computes, so a customer's score matches a full recompute however their
+# history was split into calls.
+Q, REP, ROWS, SUM, FIRST, CAT, CONF = range(7)
+
+@dataclass
+class CustomerState:
+    """Running totals for one customer; everything a score needs, no rows."""
+    n_rows: int = 0
+    months: List[int] = field(default_factory=list)
+    totals: Dict[str, Fraction] = field(default_factory=dict)  # bucket -> sum |amount|
+    counts: Dict[str, int] = field(default_factory=dict)      # bucket -> rows
+    first_seen: Dict[str, int] = field(default_factory=dict)  # bucket -> first row index
+    # Buckets whose first_seen row was re-labelled away; fixed by a rescan if the order needs it
+    stale: List[str] = field(default_factory=list)
+    conf_sum: Fraction = Fraction(0)
+    cash_withdrawn: Fraction = Fraction(0)
+    model_version: str = ''
+    # Highest client batch number applied (0 = none); committed with the totals
+    # it produced, so a batch sent twice is only ever counted once
+    last_batch_seq: int = 0
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data['totals'] = {b: str(v) for b, v in self.totals.items()}
+        data['conf_sum'], data['cash_withdrawn'] = str(self.conf_sum), str(self.cash_withdrawn)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'CustomerState':
+        data = json.loads(text)
+        data['totals'] = {b: Fraction(v) for b, v in data['totals'].items()}
+        data['conf_sum'], data['cash_withdrawn'] = Fraction(data['conf_sum']), Fraction(data['cash_withdrawn'])
+        return cls(**data)
+
+def _exact_sum(values) -> Fraction:
+    return sum(map(Fraction, values), Fraction(0))
+
+def _bucket(group) -> str:
+    return NON_POSITIVE_INCOME if group[CAT] == 'Income' and not group[Q] > 0 else group[CAT]
+
+def _remove(state: CustomerState, group) -> None:
+    b = _bucket(group)
+    state.counts[b] -= group[ROWS]
+    state.totals[b] -= Fraction(group[SUM])
+    state.conf_sum -= Fraction(group[CONF]) * group[ROWS]
+    if state.counts[b] == 0:
+        for values in (state.counts, state.totals, state.first_seen):
+            values.pop(b, None)
+        if b in state.stale:
+            state.stale.remove(b)
+    elif state.first_seen.get(b) == group[FIRST] and b not in state.stale:
+        state.stale.append(b)
+
+def _add(state: CustomerState, group) -> None:
+    b = _bucket(group)
+    state.counts[b] = state.counts.get(b, 0) + group[ROWS]
+    state.totals[b] = state.totals.get(b, 0) + Fraction(group[SUM])
+    state.conf_sum += Fraction(group[CONF]) * group[ROWS]
+    if group[FIRST] <= state.first_seen.get(b, group[FIRST]):
+        # Nothing still in the bucket starts earlier than the old minimum, so
+        # anything at or before it is the true first row again
+        state.first_seen[b] = group[FIRST]
+        if b in state.stale:
+            state.stale.remove(b)
+
+def _label(groups: list, descriptions: List[str], freqs: List[int], classify: Callable) -> None:
+    if not groups:
+        return
+    cats, confs = classify(descriptions, np.array([g[REP] for g in groups]), np.array(freqs))
+    for group, cat, conf in zip(groups, cats, confs):
+        group[CAT], group[CONF] = str(cat), float(conf)
+
+def apply_transactions(state: CustomerState, descriptions: Dict[str, dict], rows: pd.DataFrame,
+                       classify: Callable) -> Dict[str, dict]:
+    """Fold new rows into `state`; returns the description entries that changed.
+
+    `descriptions` must hold the stored entry of every description in `rows`
+    (absent if new). `rows` has description, amount and parsed date columns.
+    `classify(descriptions, amounts, freqs)` labels groups exactly as
+    categorize_transactions labels rows. Work is proportional to the new rows
+    plus the groups of the descriptions they touch.
+    """
+    n = len(rows)
+    months = rows['date'].dropna().to_numpy().astype('datetime64[M]').view(np.int64)
+    state.months = sorted(set(state.months).union(months.tolist()))
+
+    # One pass over the new rows: description -> q_amount -> [first row, raw amount, |amounts|]
+    amounts = rows['amount'].to_numpy(dtype=float)
+    arrivals = {}
+    for i, (description, q, amount) in enumerate(zip(rows['description'].tolist(), quantize(amounts).tolist(),
+                                                     amounts.tolist()), start=state.n_rows):
+        group = arrivals.setdefault(description, {}).get(q)
+        if group is None:
+            arrivals[description][q] = [i, amount, [abs(amount)]]
+        else:
+            group[2].append(abs(amount))
+
+    changed, relabel, relabel_descs, relabel_freqs = {}, [], [], []
+    for description, new_groups in arrivals.items():
+        entry = descriptions.get(description) or {'count': 0, 'cash': CASH_PATTERN.search(description) is not None,
+                                                  'groups': []}
+        old_count = entry['count']
+        entry['count'] += sum(len(values) for _, _, values in new_groups.values())
+        freq_moved = old_count == 0 or quantize(old_count) != quantize(entry['count'])
+        by_q = {g[Q]: g for g in entry['groups']}
+        for q, (first, amount, values) in new_groups.items():
+            group = by_q.get(q)
+            if group is None:
+                group = [q, amount, 0, '0', first, None, 0.0]
+                entry['groups'].append(group)
+            else:
+                _remove(state, group)
+            total = _exact_sum(values)
+            group[ROWS] += len(values)
+            group[SUM] = str(Fraction(group[SUM]) + total)
+            if entry['cash']:
+                state.cash_withdrawn += total
+        for group in entry['groups']:
+            if freq_moved or group[Q] in new_groups:
+                if group[Q] not in new_groups:
+                    _remove(state, group)
+                relabel.append(group)
+                relabel_descs.append(description)
+                relabel_freqs.append(entry['count'])
+        changed[description] = entry
+
+    _label(relabel, relabel_descs, relabel_freqs, classify)
+    for group in relabel:
+        _add(state, group)
+    state.n_rows += n
+    return changed
+
+def relabel_all(state: CustomerState, descriptions: Dict[str, dict], classify: Callable) -> None:
+    """Re-label every group, e.g. after the NLP model changed."""
+    state.totals, state.counts, state.first_seen, state.stale, state.conf_sum = {}, {}, {}, [], Fraction(0)
+    groups, descs, freqs = [], [], []
+    for description, entry in descriptions.items():
+        for group in entry['groups']:
+            groups.append(group)
+            descs.append(description)
+            freqs.append(entry['count'])
+    _label(groups, descs, freqs, classify)
+    for group in groups:
+        _add(state, group)
+
+def rescan_first_seen(state: CustomerState, descriptions: Dict[str, dict]) -> None:
+    first = {}
+    for entry in descriptions.values():
+        for group in entry['groups']:
+            b = _bucket(group)
+            first[b] = min(first.get(b, group[FIRST]), group[FIRST])
+    state.first_seen, state.stale = first, []
+
+def needs_rescan(state: CustomerState) -> bool:
+    # first_seen only breaks ties between equal counts in the distribution
+    if not state.stale:
+        return False
+    counts = _category_counts(state)
+    stale = {'Income' if b == NON_POSITIVE_INCOME else b for b in state.stale}
+    return any(counts[c] == counts[o] for c in stale if c in counts for o in counts if o != c)
+
+def _category_counts(state: CustomerState) -> Dict[str, int]:
+    counts = {}
+    for b, n in state.counts.items():
+        cat = 'Income' if b == NON_POSITIVE_INCOME else b
+        counts[cat] = counts.get(cat, 0) + n
+    return counts
+
+def to_features(state: CustomerState) -> BehavioralFeatures:
+    """The same BehavioralFeatures aggregate_features builds from the full history."""
+    counts = _category_counts(state)
+    first = {}
+    for b, i in state.first_seen.items():
+        cat = 'Income' if b == NON_POSITIVE_INCOME else b
+        first[cat] = min(first.get(cat, i), i)
+    ranked = sorted(counts, key=lambda c: (-counts[c], first[c]))
+    total = lambda cat: np.array([float(state.totals.get(cat, 0))])
+    return BehavioralFeatures(
+        total_income=total('Income'),
+        essential_spend=total('Essential'),
+        leisure_spend=total('Leisure'),
+        risky_spend=total('Risky'),
+        investment_spend=total('Investment'),
+        cash_withdrawn=np.array([float(state.cash_withdrawn)]),
+        valid_months=np.array([len(state.months)]),
+        conf_mean=np.array([float(state.conf_sum) / state.n_rows]),
+        category_distribution=[{c: counts[c] for c in ranked}],
+    )
+
+# ==========================================
+# 3. SQLITE STORE
+# ==========================================
+class FeatureStore:
+    """Customer state in one SQLite file: a summary row per customer plus one
+    row per (customer, description), so an update reads and writes only the
+    descriptions it touches. WAL mode + BEGIN IMMEDIATE let worker processes
+    share the file and serialize updates to the same customer."""
+
+    def __init__(self, path: str = FEATURE_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS customer_state '
+                         '(customer_id TEXT PRIMARY KEY, state TEXT NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS description_state (customer_id TEXT, description TEXT, '
+                         'state TEXT NOT NULL, PRIMARY KEY (customer_id, description))')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _load_descriptions(conn, customer_id: str, descriptions=None) -> Dict[str, dict]:
+        if descriptions is None:
+            rows = conn.execute('SELECT description, state FROM description_state WHERE customer_id = ?',
+                                (customer_id,)).fetchall()
+            return {d: json.loads(s) for d, s in rows}
+        found = {}
+        descriptions = list(descriptions)
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(descriptions), 500):
+            chunk = descriptions[start:start + 500]
+            rows = conn.execute(
+                f'SELECT description, state FROM description_state WHERE customer_id = ? '
+                f'AND description IN ({",".join("?" * len(chunk))})', (customer_id, *chunk)).fetchall()
+            found.update((d, json.loads(s)) for d, s in rows)
+        return found
+
+    def update(self, customer_id: str, rows: pd.DataFrame, classify: Callable, model_version: str,
+               batch_seq: Optional[int] = None) -> Tuple[CustomerState, bool]:
+        """Apply new rows to a customer's stored state; returns the new state and whether they were applied.
+
+        With `batch_seq`, rows are applied only if it is above the customer's
+        last applied batch. A retry of a batch that already committed (e.g.
+        after the client gave up on a slow request) is skipped, and the state
+        is still brought up to `model_version`. Without it rows always apply.
+        """
+        with self.transaction() as conn:
+            row = conn.execute('SELECT state FROM customer_state WHERE customer_id = ?', (customer_id,)).fetchone()
+            state = CustomerState.from_json(row[0]) if row else CustomerState(model_version=model_version)
+            applied = batch_seq is None or batch_seq > state.last_batch_seq
+            if not applied:
+                rows = rows.iloc[:0]
+            elif batch_seq is not None:
+                state.last_batch_seq = batch_seq
+            changed = {}
+            if state.model_version != model_version:
+                # Labels came from another model generation: re-label every stored group once
+                changed = self._load_descriptions(conn, customer_id)
+                relabel_all(state, changed, classify)
+                state.model_version = model_version
+            stored = {d: changed[d] for d in rows['description'].unique() if d in changed}
+            missing = [d for d in rows['description'].unique() if d not in changed]
+            stored.update(self._load_descriptions(conn, customer_id, missing))
+            changed.update(apply_transactions(state, stored, rows, classify))
+            if needs_rescan(state):
+                everything = self._load_descriptions(conn, customer_id)
+                everything.update(changed)
+                rescan_first_seen(state, everything)
+            conn.executemany('INSERT OR REPLACE INTO description_state VALUES (?, ?, ?)',
+                             [(customer_id, d, json.dumps(e)) for d, e in changed.items()])
+            conn.execute('INSERT OR REPLACE INTO customer_state VALUES (?, ?)',
+                         (customer_id, state.to_json()))
+        return state, applied
+
+    def delete(self, customer_id: str) -> bool:
+        with self.transaction() as conn:
+            deleted = conn.execute('DELETE FROM customer_state WHERE customer_id = ?', (customer_id,)).rowcount
+            conn.execute('DELETE FROM description_state WHERE customer_id = ?', (customer_id,))
+        return deleted > 0
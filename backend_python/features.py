@@ -0,0 +1,213 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# 1. FEATURE STRUCT
+# ==========================================
+CATEGORIES = ['Income', 'Essential', 'Investment', 'Leisure', 'Risky']
+
+# Same rule as str.contains('ATM|CASH|WITHDRAWAL', case=False)
+CASH_PATTERN = re.compile(r'ATM|CASH|WITHDRAWAL', re.IGNORECASE)
+
+# Month index of a row with no valid date
+NO_MONTH = np.iinfo(np.int32).min
+
+@dataclass
+class BehavioralFeatures:
+    """Per-customer behavioral totals; every array has one entry per customer."""
+    total_income: np.ndarray
+    essential_spend: np.ndarray
+    leisure_spend: np.ndarray
+    risky_spend: np.ndarray
+    investment_spend: np.ndarray
+    cash_withdrawn: np.ndarray
+    valid_months: np.ndarray
+    conf_mean: np.ndarray
+    category_distribution: List[dict]
+
+    def __len__(self) -> int:
+        return len(self.total_income)
+
+# ==========================================
+# 2. COMPACT ROW LAYOUT
+# ==========================================
+# A categorized frame keeps one small fixed-width value per row and column:
+# description as a Categorical (int32 or smaller ids into the distinct
+# descriptions, which the freq counts and the per-description keyword, cash
+# and model-text work share), cat as a Categorical (int8 codes), month as
+# int32 months since 1970-01 and customer as int32. conf stays float64: the
+# model's confidences are vote shares whose means often sit exactly on a
+# half percent, and float32 rounding would flip the reported percentage.
+def interned(descriptions: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """(id per row, distinct descriptions): a Categorical's own codes, else one factorize pass.
+
+    The distinct descriptions keep the column's string storage (Arrow-backed
+    by default), which for mostly-unique UPI descriptions is far smaller than
+    one Python str each.
+    """
+    if isinstance(descriptions.dtype, pd.CategoricalDtype):
+        return descriptions.cat.codes.to_numpy(), descriptions.cat.categories
+    return pd.factorize(descriptions)
+
+def month_index(dates: pd.Series) -> np.ndarray:
+    """Months since 1970-01 as int32; NO_MONTH where the date is missing."""
+    months = dates.to_numpy().astype('datetime64[M]')
+    return np.where(np.isnat(months), NO_MONTH, months.view(np.int64)).astype(np.int32)
+
+def category_list(*labels) -> List[str]:
+    """CATEGORIES followed by any other labels seen, sorted."""
+    extra = sorted(set().union(*map(set, labels)) - set(CATEGORIES))
+    return CATEGORIES + extra
+
+def codes_for(labels, categories: List[str]) -> np.ndarray:
+    """Position of each label in `categories` (-1 if absent); meant for distinct labels."""
+    lookup = {name: code for code, name in enumerate(categories)}
+    return np.array([lookup.get(label, -1) for label in labels], dtype=np.int16)
+
+def as_categorical(codes: np.ndarray, categories: List[str]) -> pd.Categorical:
+    # pandas stores the codes in the smallest int type that fits: int8 here
+    return pd.Categorical.from_codes(codes, categories)
+
+# ==========================================
+# 3. AGGREGATION
+# ==========================================
+def cash_mask(descriptions: pd.Series) -> np.ndarray:
+    # Descriptions repeat heavily within a statement, so test each distinct one once
+    codes, uniques = interned(descriptions)
+    hits = np.fromiter((CASH_PATTERN.search(d) is not None for d in uniques), dtype=bool, count=len(uniques))
+    return hits[codes]
+
+def category_codes(cat):
+    """Small-int code per row plus the category list the codes index into.
+
+    Codes follow category_list order, so Income is always 0. A Categorical
+    is remapped through its (few) categories. For plain labels a handful of
+    equality scans beat hashing every row through pandas, both in time and
+    in the size of the temporary hash table.
+    """
+    if isinstance(cat, pd.Categorical):
+        categories = category_list(cat.categories)
+        # A fresh array, so callers may relabel rows without touching the frame
+        return codes_for(cat.categories, categories)[cat.codes], categories
+    codes = np.full(len(cat), -1, dtype=np.int32)
+    for code, name in enumerate(CATEGORIES):
+        codes[cat == name] = code
+    unknown = codes < 0
+    if not unknown.any():
+        return codes, list(CATEGORIES)
+    extra = sorted(set(cat[unknown]))
+    for code, name in enumerate(extra, start=len(CATEGORIES)):
+        codes[cat == name] = code
+    return codes, CATEGORIES + extra
+
+def _slice_sums(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Sum consecutive runs of `values` whose lengths are `counts`.
+
+    Every run is summed exactly and rounded once (math.fsum), so a total does
+    not depend on row order or on how the rows were split up: the incremental
+    feature store keeps exact running sums and lands on the same float. A
+    plain or pairwise float sum can differ in the last bit, enough to flip a
+    rounded percentage in the payload.
+    """
+    ends = np.cumsum(counts)
+    sums = np.zeros(len(counts), dtype=float)
+    for i in np.flatnonzero(counts):
+        sums[i] = math.fsum(values[ends[i] - counts[i]:ends[i]].tolist())
+    return sums
+
+def _bucket_totals(customer: np.ndarray, bucket: np.ndarray, amount: np.ndarray, n_customers: int, n_buckets: int):
+    """Spend total, row count and first row index per (customer, bucket).
+
+    Buckets are small ints, so selecting one is a cheap integer compare. The
+    selected rows keep their original order and stay grouped by customer, so
+    every total is a contiguous run of one small temporary array.
+    """
+    shape = (n_customers, n_buckets)
+    totals = np.zeros(shape)
+    counts = np.zeros(shape, dtype=np.int64)
+    first_seen = np.full(shape, len(amount), dtype=np.int64)
+    for b in range(n_buckets):
+        rows = np.flatnonzero(bucket == b)
+        if not len(rows):
+            continue
+        run_lengths = np.bincount(customer[rows], minlength=n_customers)
+        totals[:, b] = _slice_sums(np.abs(amount[rows]), run_lengths)
+        counts[:, b] = run_lengths
+        has_rows = run_lengths > 0
+        first_seen[has_rows, b] = rows[(np.cumsum(run_lengths) - run_lengths)[has_rows]]
+    return totals, counts, first_seen
+
+def _distinct_months(customer: np.ndarray, month: np.ndarray, n_customers: int) -> np.ndarray:
+    # Only count months that have at least one valid (non-NaT) transaction
+    has_date = month != NO_MONTH
+    months = month.astype(np.int64)
+    if not has_date.all():
+        months, customer = months[has_date], customer[has_date]
+    if not len(months):
+        return np.zeros(n_customers, dtype=np.int64)
+    # Turn months into slots of a (customer, month) grid in place
+    first = months.min()
+    span = int(months.max() - first) + 1
+    months -= first
+    if n_customers > 1:
+        months += customer.astype(np.int64) * span
+    if n_customers * span <= 4 * len(months):
+        # Usual case: a few years of statement, so a presence grid is tiny
+        present = np.zeros(n_customers * span, dtype=bool)
+        present[months] = True
+        return present.reshape(n_customers, span).sum(axis=1)
+    return np.bincount(np.unique(months) // span, minlength=n_customers)
+
+def aggregate_features(df: pd.DataFrame) -> BehavioralFeatures:
+    """Fold a categorized frame into BehavioralFeatures.
+
+    Every row gets one small-int bucket (its category, with Income split by
+    sign) and every total, count and first appearance is read off those
+    buckets; no filtered copies of the frame are built. Rows must be grouped
+    by `customer` (0..N-1, in order), as build_frame produces them, in the
+    compact layout categorize_frame leaves.
+    """
+    customer = df['customer'].to_numpy().astype(np.int32, copy=False)
+    n_customers = int(customer[-1]) + 1
+    amount = df['amount'].to_numpy(dtype=float)
+
+    # Income = only positive-amount transactions classified as Income
+    # (guards against GPT sending ambiguous credits that the NLP mislabels).
+    # Non-positive Income rows get their own bucket so they never reach the total.
+    bucket, categories = category_codes(df['cat'].array)
+    n_cats = len(categories)
+    bucket[(bucket == 0) & ~(amount > 0)] = n_cats
+    totals, counts, first_seen = _bucket_totals(customer, bucket, amount, n_customers, n_cats + 1)
+
+    # CASH BLIND-SPOT DETECTION
+    is_cash = cash_mask(df['description'])
+    cash_withdrawn = _slice_sums(np.abs(amount[is_cash]), np.bincount(customer[is_cash], minlength=n_customers))
+
+    rows_per_customer = np.bincount(customer, minlength=n_customers)
+    conf_mean = _slice_sums(df['conf'].to_numpy(dtype=float), rows_per_customer) / rows_per_customer
+
+    # Category counts in Series.value_counts() order: count desc, ties by first appearance
+    cat_counts = counts[:, :n_cats].copy()
+    cat_counts[:, 0] += counts[:, n_cats]
+    first_seen[:, 0] = np.minimum(first_seen[:, 0], first_seen[:, n_cats])
+    distributions = []
+    for c in range(n_customers):
+        ranked = sorted(np.flatnonzero(cat_counts[c]), key=lambda k: (-cat_counts[c, k], first_seen[c, k]))
+        distributions.append({categories[k]: int(cat_counts[c, k]) for k in ranked})
+
+    return BehavioralFeatures(
+        total_income=totals[:, 0],
+        essential_spend=totals[:, categories.index('Essential')],
+        leisure_spend=totals[:, categories.index('Leisure')],
+        risky_spend=totals[:, categories.index('Risky')],
+        investment_spend=totals[:, categories.index('Investment')],
+        cash_withdrawn=cash_withdrawn,
+        valid_months=_distinct_months(customer, df['month'].to_numpy(), n_customers),
+        conf_mean=conf_mean,
+        category_distribution=distributions,
+    )
@@ -1,188 +1,780 @@
-from fastapi import FastAPI
-import joblib
+from fastapi import FastAPI, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse
 import pandas as pd
 import numpy as np
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, List
 import uvicorn
+import os
+import sys
+import hashlib
+import json
 import warnings
-import re
+from keyword_engine import KeywordMatcher, normalize_descriptions
+from category_cache import CACHE_SIG_DIGITS, CategoryCache, merge_stats, quantize
+from features import (CATEGORIES, BehavioralFeatures, aggregate_features, as_categorical, category_list,
+                      codes_for, interned, month_index)
+from date_parser import parse_dates
+from scoring import compile_pd_model, score_ratios
+from model_registry import ModelRegistry, ModelSet
+from worker_pool import PoolUnavailable, ScoringPool
+from columnar import NDJSON_TYPES, NDJSONDecoder, UnsupportedFormat, parse_columns
+from feature_store import FeatureStore, to_features
+from result_cache import ResultCache, payload_digest, result_key
+from streaming import STREAM_CHUNK_ROWS, StatementStream
+from what_if import RATIOS, WHAT_IF_MAX_POINTS, grid_points, score_surface
+from metrics import (FRACTION_BUCKETS, LATENCY_BUCKETS, SERVER_TIMING, SIZE_BUCKETS, Counter, Gauge,
+                     Histogram, MetricsRegistry, RequestClock, StageTimer, server_timing)
+from time import perf_counter
+from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 warnings.filterwarnings("ignore", category=UserWarning)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load + warm before taking traffic, then watch the files for new artifacts.
+    # With a process pool the workers do that for themselves.
+    if scoring_pool.workers > 0:
+        await scoring_pool.start(worker_status)
+        yield
+        scoring_pool.shutdown()
+        return
+    model_registry.load()
+    model_registry.start_watching()
+    yield
+    model_registry.stop_watching()
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestClock)
 
 # ==========================================
-# 1. LOAD THE DUAL MODELS
+# 2. BATCH CATEGORIZER
 # ==========================================
-try:
-    nlp_model = joblib.load('credit_brain.pkl')
-    pd_model = joblib.load('pd_model.pkl')
-except Exception as e:
-    nlp_model = None
-    pd_model = None
-    print(f"⚠️ Warning: Model files not found! Error: {e}")
+keyword_matcher = KeywordMatcher.from_file('keyword_rules.csv')
+category_cache = CategoryCache()
+
+def categorize_transactions(df: pd.DataFrame, freqs: np.ndarray, nlp_model, timer: StageTimer = None):
+    """Label every row of a statement at once.
+
+    Keyword rules are applied as column masks; whatever they miss goes to the
+    NLP model in a single predict_proba call. `freqs` is each row's description
+    count within its statement. Returns (categories, confidences) aligned with
+    df's rows: a Categorical (int8 codes) and float64.
+    """
+    timer = timer if timer is not None else StageTimer()
+    n = len(df)
+    codes = np.full(n, CATEGORIES.index("Essential"), dtype=np.int16)
+    confs = np.ones(n, dtype=float)
+    if nlp_model is None or n == 0:
+        return as_categorical(codes, CATEGORIES), confs
+
+    # Keyword rules depend on the text alone: match each distinct description once
+    description_ids, descriptions = interned(df['description'])
+    keyword_cats = keyword_labels(pd.Series(descriptions), nlp_model)
+    to_model = pd.isna(keyword_cats)
+    model_mask = to_model[description_ids]
+    n_model = int(model_mask.sum())
+    timer.count('keyword_rows', n - n_model)
+    timer.count('model_rows', n_model)
+    timer.lap('keywords')
+
+    if not model_mask.any():
+        categories = category_list(keyword_cats[~to_model])
+        return as_categorical(codes_for(keyword_cats, categories)[description_ids], categories), confs
+
+    labels, scores = predict_cached(description_ids[model_mask], descriptions, df['amount'].to_numpy()[model_mask],
+                                    freqs[model_mask], nlp_model)
+    timer.lap('nlp_model')
+    categories = category_list(keyword_cats[~to_model], labels.categories)
+    codes[~model_mask] = codes_for(keyword_cats, categories)[description_ids[~model_mask]]
+    codes[model_mask] = codes_for(labels.categories, categories)[labels.codes]
+    confs[model_mask] = scores
+    return as_categorical(codes, categories), confs
+
+def keyword_labels(descriptions: pd.Series, nlp_model) -> np.ndarray:
+    """Label per row that no count or model can change; None where the model decides."""
+    if nlp_model is None:
+        return np.full(len(descriptions), "Essential", dtype=object)
+    # Keyword pre-classifier: Income > Investment > merchant rules from keyword_rules.csv
+    return keyword_matcher.match(normalize_descriptions(descriptions))
+
+def predict_cached(description_ids: np.ndarray, descriptions: pd.Index, amounts: np.ndarray,
+                   freqs: np.ndarray, nlp_model):
+    """(category, confidence) per row, running the NLP model only on cache misses.
+
+    Rows name their description by id into `descriptions`. Returns a
+    Categorical of labels and the confidences.
+    """
+    text_key = category_cache.text_key_for(nlp_model)
+    used = np.unique(description_ids)
+    texts = np.empty(len(descriptions), dtype=object)
+    texts[used] = [text_key(d) for d in descriptions[used]]
+    keys = list(zip(texts[description_ids].tolist(), quantize(amounts).tolist(), quantize(freqs).tolist()))
+
+    # Look each distinct key up once; repeats inside a statement are free
+    key_ids = {}
+    rows = np.fromiter((key_ids.setdefault(k, len(key_ids)) for k in keys), dtype=np.int64, count=len(keys))
+    unique_keys = list(key_ids)
+    resolved = dict(zip(unique_keys, category_cache.get_many(unique_keys, nlp_model)))
+    missing = [k for k, v in resolved.items() if v is None]
+    if missing:
+        features = pd.DataFrame(missing, columns=['text', 'amount', 'freq'])
+        probs = nlp_model.predict_proba(features)
+        max_idx = probs.argmax(axis=1)
+        fresh = list(zip(nlp_model.classes_[max_idx].tolist(), probs[np.arange(len(max_idx)), max_idx].tolist()))
+        category_cache.put_many(zip(missing, fresh), nlp_model)
+        resolved.update(zip(missing, fresh))
+
+    key_labels = [resolved[k][0] for k in unique_keys]
+    categories = category_list(key_labels)
+    labels = as_categorical(codes_for(key_labels, categories)[rows], categories)
+    scores = np.array([resolved[k][1] for k in unique_keys], dtype=float)[rows]
+    return labels, scores
 
 class Transaction(BaseModel):
     description: str
     amount: float
     date: str 
 
-@app.post("/get-score")
-def calculate_score(txns: List[Transaction]):
+@app.get("/cache-stats")
+def cache_stats():
+    # With a worker pool each worker has its own category cache, and this
+    # process has one too for what it categorizes itself (/get-score-stream).
+    # Report their totals, each worker as of the last job it finished, plus
+    # the per-process breakdown under "server" and the worker pids
+    if scoring_pool.workers > 0:
+        caches = {"server": category_cache.stats(), **{pid: w['category_cache'] for pid, w in worker_states.items()}}
+        category = {**merge_stats(list(caches.values())), "processes": caches}
+    else:
+        category = category_cache.stats()
+    return {"category_cache": category, "result_cache": result_cache.stats()}
+
+# One customer's transactions; an empty statement is a 422 on every route, like the columns check
+Statement = Annotated[List[Transaction], Field(min_length=1)]
+
+class CustomerStatement(BaseModel):
+    customer_id: str
+    transactions: Statement
+
+class IncrementalStatement(CustomerStatement):
+    """New transactions for one customer, numbered so a retried batch is applied once.
+
+    `batch_seq` increases with every batch the client sends for the customer;
+    a batch at or below the last one applied is answered but not counted again.
+    """
+    batch_seq: int = Field(ge=1)
+
+Multiplier = Annotated[float, Field(ge=0, allow_inf_nan=False)]
+
+class WhatIfScales(BaseModel):
+    """Multipliers to try on each of the customer's ratios; 1.0 leaves it as observed."""
+    avg_monthly_income: List[Multiplier] = Field(default=[1.0], min_length=1)
+    savings_rate: List[Multiplier] = Field(default=[1.0], min_length=1)
+    risky_ratio: List[Multiplier] = Field(default=[1.0], min_length=1)
+    cash_ratio: List[Multiplier] = Field(default=[1.0], min_length=1)
+
+    @model_validator(mode='after')
+    def check_size(self):
+        points = grid_points(self.model_dump())
+        if points > WHAT_IF_MAX_POINTS:
+            raise ValueError(f"Grid has {points} points; at most {WHAT_IF_MAX_POINTS} are allowed")
+        return self
+
+class WhatIfRequest(BaseModel):
+    transactions: Statement
+    scale: WhatIfScales = Field(default_factory=WhatIfScales)
+
+# ==========================================
+# 3. SCORING PIPELINE (shared by single + batch)
+# ==========================================
+def statement_columns(statements: List[List[Transaction]]) -> dict:
+    """Flatten statements into plain column lists plus each statement's length.
+
+    This is also what gets shipped to a worker process: lists of str/float
+    pickle far faster than pydantic objects. Columnar uploads (columnar.py)
+    produce the same layout without ever building Transaction objects.
+    """
+    columns = {'description': [], 'amount': [], 'date': [], 'lengths': []}
+    for txns in statements:
+        for t in txns:
+            columns['description'].append(t.description)
+            columns['amount'].append(t.amount)
+            columns['date'].append(t.date)
+        columns['lengths'].append(len(txns))
+    return columns
+
+def frame_from_columns(columns: dict) -> pd.DataFrame:
+    """One DataFrame for every statement, tagged with its position in `customer`."""
+    df = pd.DataFrame({name: columns[name] for name in ('description', 'amount', 'date')})
+    lengths = columns['lengths']
+    df['customer'] = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+    return df
+
+def build_frame(statements: List[List[Transaction]]) -> pd.DataFrame:
+    return frame_from_columns(statement_columns(statements))
+
+def categorize_frame(df: pd.DataFrame, models: ModelSet, timer: StageTimer = None) -> pd.DataFrame:
+    """Label a frame's rows and leave it in the compact layout (see features.py).
+
+    The raw date strings are replaced by an int32 month index and each
+    description by an id into the distinct descriptions.
+    """
+    timer = timer if timer is not None else StageTimer()
     # A. PRE-PROCESSING
-    df = pd.DataFrame([t.model_dump() for t in txns])
-
-    # Parse ISO dates strictly first (YYYY-MM-DD) to avoid day/month inversion.
-    # Fallback to mixed day-first parsing only for non-ISO strings.
-    raw_dates = df['date'].astype(str).str.strip()
-    iso_mask = raw_dates.str.match(r'^\d{4}-\d{2}-\d{2}$')
-    parsed_dates = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
-    parsed_dates.loc[iso_mask] = pd.to_datetime(raw_dates.loc[iso_mask], format='%Y-%m-%d', errors='coerce')
-    parsed_dates.loc[~iso_mask] = pd.to_datetime(raw_dates.loc[~iso_mask], format='mixed', dayfirst=True, errors='coerce')
-
-    df['date'] = parsed_dates
-    df['month_year'] = df['date'].dt.to_period('M')
-    
+    df['month'] = month_index(parse_dates(df['date']))
+    del df['date']
+    description_ids, descriptions = interned(df['description'])
+    df['description'] = pd.Categorical.from_codes(description_ids, descriptions)
+    timer.lap('dates')
+
     # B. NLP CATEGORIZATION (Feature Extraction)
-    freq_map = df['description'].value_counts().to_dict()
-
-    INCOME_KEYWORDS = ['salary', 'neftcredit', 'creditinterest', 'freelancecredit', 
-                        'interestcredit', 'refund', 'cashback', 'dividend', 'bonuscredit']
-    INVESTMENT_KEYWORDS = ['sip', 'elss', 'mutualfund', 'mf', 'equitysip', 'nps', 
-                           'ppf', 'indexfund', 'nifty', 'sensex', 'lic', 'insurancepremium',
-                           'healthinsurance', 'terminsurance']
-
-    def normalize_text(value: str) -> str:
-        lower = str(value).lower().strip()
-        return re.sub(r'[^a-z0-9]', '', lower)
-
-    def predict_with_confidence(row):
-        if nlp_model is None: return "Essential", 1.0
-        desc_normalized = normalize_text(row['description'])
-
-        # Keyword pre-classifier: Income
-        if any(k in desc_normalized for k in INCOME_KEYWORDS):
-            return "Income", 1.0
-
-        # Keyword pre-classifier: Investment
-        if any(k in desc_normalized for k in INVESTMENT_KEYWORDS):
-            return "Investment", 1.0
-
-        features = pd.DataFrame([[row['description'], row['amount'], freq_map[row['description']]]], 
-                                columns=['text', 'amount', 'freq'])
-        probs = nlp_model.predict_proba(features)[0] 
-        max_idx = np.argmax(probs)
-        return nlp_model.classes_[max_idx], probs[max_idx]
-
-    results = df.apply(predict_with_confidence, axis=1)
-    df['cat'] = [r[0] for r in results]
-    df['conf'] = [r[1] for r in results]
-    
-    # C. BEHAVIORAL FEATURES
-    # Only count months that have at least one valid (non-NaT) transaction
-    valid_months = df[df['month_year'].notna()]['month_year'].nunique()
-    total_months = valid_months if valid_months > 0 else 1
+    # freq = how often the description repeats within its own statement, counted on the ids
+    customer = df['customer'].to_numpy()
+    if not len(customer) or customer[-1] == 0:
+        per_statement = description_ids
+    else:
+        per_statement = pd.factorize(customer.astype(np.int64) * len(descriptions) + description_ids)[0]
+    freqs = np.bincount(per_statement)[per_statement]
+    cats, confs = categorize_transactions(df, freqs, models.nlp_model, timer)
+    df['cat'] = cats
+    df['conf'] = confs
+    return df
 
-    # Income = only positive-amount transactions classified as Income
-    # (guards against GPT sending ambiguous credits that the NLP mislabels)
-    total_income = df[(df['cat'] == 'Income') & (df['amount'] > 0)]['amount'].sum()
-    avg_monthly_income = total_income / total_months if total_months > 0 else 0
+def behavioral_ratios(feats: BehavioralFeatures) -> dict:
+    """The four ratios the score is computed from, one entry per customer."""
+    total_income = feats.total_income
+    has_income = total_income > 0
+    safe_income = np.where(has_income, total_income, 1.0)
 
+    # C. BEHAVIORAL FEATURES
+    avg_monthly_income = total_income / np.maximum(feats.valid_months, 1)
     # Actual spending = Essential + Leisure + Risky (investments are savings, not spending)
-    essential_spend = df[df['cat'] == 'Essential']['amount'].abs().sum()
-    leisure_spend   = df[df['cat'] == 'Leisure']['amount'].abs().sum()
-    risky_spend     = df[df['cat'] == 'Risky']['amount'].abs().sum()
-    net_spend = max(1, essential_spend + leisure_spend + risky_spend)
-
+    net_spend = np.maximum(1, feats.essential_spend + feats.leisure_spend + feats.risky_spend)
     # Savings rate = share of income NOT consumed by expenses
     # (investments count as saved/deployed money, not as spending)
-    savings_rate = max(0.0, (total_income - net_spend) / total_income) if total_income > 0 else 0
-    risky_amt = risky_spend  # already computed above
-    risky_ratio = risky_amt / net_spend if net_spend > 0 else 0
-
-    # CASH BLIND-SPOT DETECTION
-    cash_df = df[df['description'].str.contains('ATM|CASH|WITHDRAWAL', case=False)]
-    total_cash_withdrawn = cash_df['amount'].abs().sum()
-    cash_ratio = total_cash_withdrawn / total_income if total_income > 0 else 0
-
-    # D. THE PD LAYER (LOGISTIC REGRESSION)
-    ml_features = np.array([[savings_rate, risky_ratio]])
-    
-    if pd_model:
-        prob_default = pd_model.predict_proba(ml_features)[0][1]
-        
-        # Blind-Spot Penalty: Increase risk probability if behavior is hidden in cash
-        if cash_ratio > 0.3:
-            prob_default = min(1.0, prob_default + (cash_ratio * 0.25))
-    else:
-        prob_default = 0.5 
-
-    # E. NATURAL SCALING
-    raw_ml_score = 350 + ((1 - prob_default) * 530)
-    
-    # F. STABILITY-BOOSTED CAPACITY
-    if avg_monthly_income > 0:
-        base_mult = 0.45 + (np.log10(avg_monthly_income) / 11)
-        
-        # Stability Bonus: Rewards 0% Risk + Elite Savings (40%+) + Transparency
-        stability_bonus = 0.06 if (risky_ratio == 0 and savings_rate > 0.4 and cash_ratio < 0.2) else 0
-        
-        capacity_multiplier = min(base_mult + stability_bonus, 1.1)
-    else:
-        capacity_multiplier = 0.45
-        stability_bonus = 0
-    
-    final_score = int(raw_ml_score * capacity_multiplier)
-    final_score = max(300, min(900, final_score))
+    savings_rate = np.where(has_income, np.maximum(0.0, (total_income - net_spend) / safe_income), 0.0)
+    risky_ratio = feats.risky_spend / net_spend
+    cash_ratio = np.where(has_income, feats.cash_withdrawn / safe_income, 0.0)
+    return {'avg_monthly_income': avg_monthly_income, 'savings_rate': savings_rate,
+            'risky_ratio': risky_ratio, 'cash_ratio': cash_ratio}
+
+def score_features(feats: BehavioralFeatures, pd_model) -> dict:
+    """Ratios, PD and final score for every customer in one vectorized pass."""
+    # D-F. PD, blind-spot penalty, scaling and capacity on plain arrays
+    return score_ratios(compile_pd_model(pd_model), **behavioral_ratios(feats))
+
+def build_payload(feats: BehavioralFeatures, scores: dict, i: int) -> dict:
+    # Values stay numpy scalars: round() on np.float64 rounds differently from
+    # round() on a Python float, and the payload strings depend on it
+    s = {name: values[i] for name, values in scores.items()}
 
     # INSIGHTS LOGIC
-    if risky_ratio > 0.1:
+    if s['risky_ratio'] > 0.1:
         primary_driver = "Speculative/Risky Spending Detected"
-    elif cash_ratio > 0.3:
+    elif s['cash_ratio'] > 0.3:
         primary_driver = "High Cash Usage (Behavioral Blind-Spot)"
-    elif savings_rate < 0.15:
+    elif s['savings_rate'] < 0.15:
         primary_driver = "Low Monthly Savings Rate"
     else:
         primary_driver = "Consistent Financial Discipline"
 
-   # Extracting exact Rupee amounts for category-specific insights
-    # .abs().sum() ensures we get a positive total for debits
-    leisure_amt = df[df['cat'] == 'Leisure']['amount'].abs().sum()
-    investment_amt = df[df['cat'] == 'Investment']['amount'].abs().sum()
-    essential_amt = df[df['cat'] == 'Essential']['amount'].abs().sum()
-
+    final_score = int(s['final_score'])
+    prob_default = s['prob_default']
     return {
         "credit_score": final_score,
         "behavioral_insights": {
             "financial_health_metrics": {
-                "monthly_income_avg": f"₹{round(avg_monthly_income, 2)}",
-                "savings_rate": f"{round(savings_rate * 100)}%",
-                "transparency_index": f"{round((1 - cash_ratio) * 100)}%",
+                "monthly_income_avg": f"₹{round(s['avg_monthly_income'], 2)}",
+                "savings_rate": f"{round(s['savings_rate'] * 100)}%",
+                "transparency_index": f"{round((1 - s['cash_ratio']) * 100)}%",
             },
             "spending_breakdown_rupees": {
-                "total_income": f"₹{round(total_income, 2)}",
-                "total_investment": f"₹{round(investment_amt, 2)}",
-                "total_risky": f"₹{round(risky_amt, 2)}",
-                "total_leisure": f"₹{round(leisure_amt, 2)}",
-                "total_essential": f"₹{round(essential_amt, 2)}"
+                "total_income": f"₹{round(feats.total_income[i], 2)}",
+                "total_investment": f"₹{round(feats.investment_spend[i], 2)}",
+                "total_risky": f"₹{round(feats.risky_spend[i], 2)}",
+                "total_leisure": f"₹{round(feats.leisure_spend[i], 2)}",
+                "total_essential": f"₹{round(feats.essential_spend[i], 2)}"
             },
-            "category_distribution": df['cat'].value_counts().to_dict(),
+            "category_distribution": feats.category_distribution[i],
             "ai_verdict": {
                 "risk_status": "High" if prob_default > 0.6 else "Moderate" if prob_default > 0.3 else "Low",
                 "primary_impact_factor": primary_driver,
-                "stability_bonus": "Applied" if stability_bonus > 0 else "Not Eligible"
+                "stability_bonus": "Applied" if s['stability_bonus'] > 0 else "Not Eligible"
             }
         },
         "ml_engine_diagnostics": {
             "probability_of_default": f"{round(prob_default * 100, 2)}%",
-            "nlp_classification_confidence": f"{round(df['conf'].mean() * 100)}%",
-            "capacity_multiplier_used": round(capacity_multiplier, 3)
+            "nlp_classification_confidence": f"{round(feats.conf_mean[i] * 100)}%",
+            "capacity_multiplier_used": round(s['capacity_multiplier'], 3)
         },
         "market_analysis": {
             "status": "Excellent" if final_score > 750 else "Good" if final_score > 650 else "High Risk",
-            "cash_usage_alert": "High (Action Required)" if cash_ratio > 0.4 else "Normal"
+            "cash_usage_alert": "High (Action Required)" if s['cash_ratio'] > 0.4 else "Normal"
         }
     }
 
+def score_columns(columns: dict, timer: StageTimer = None, models: ModelSet = None) -> List[dict]:
+    timer = timer if timer is not None else StageTimer()
+    # One generation of models for the whole request, even if a reload lands mid-way
+    models = models if models is not None else model_registry.current()
+    df = frame_from_columns(columns)
+    timer.count('transactions', len(df))
+    timer.lap('frame')
+    feats = aggregate_features(categorize_frame(df, models, timer))
+    timer.lap('aggregate')
+    scores = score_features(feats, models.pd_model)
+    timer.lap('score')
+    payloads = [build_payload(feats, scores, i) for i in range(len(feats))]
+    timer.lap('format')
+    return payloads
+
+def score_columns_timed(columns: dict):
+    # What the routes run (possibly in a worker): payloads plus where the time went
+    timer = StageTimer()
+    return score_columns(columns, timer), timer
+
+def score_columns_versioned(columns: dict):
+    # As score_columns_timed, plus the model generation that produced the payloads
+    timer = StageTimer()
+    models = model_registry.current()
+    return (score_columns(columns, timer, models), models.version), timer
+
+def score_statements(statements: List[List[Transaction]]) -> List[dict]:
+    return score_columns(statement_columns(statements))
+
+def score_what_if(columns: dict, scales: dict):
+    """Categorize one statement once, then score a grid of scaled ratios around it.
+
+    Returns the customer's own score and ratios plus the score surface, with
+    one nested-list dimension per ratio in RATIOS order.
+    """
+    timer = StageTimer()
+    models = model_registry.current()
+    df = frame_from_columns(columns)
+    timer.count('transactions', len(df))
+    timer.lap('frame')
+    feats = aggregate_features(categorize_frame(df, models, timer))
+    timer.lap('aggregate')
+    base = {name: values[0] for name, values in behavioral_ratios(feats).items()}
+    scores = score_features(feats, models.pd_model)
+    timer.lap('score')
+    surface = score_surface(compile_pd_model(models.pd_model), base, scales)
+    timer.count('grid_points', surface['final_score'].size)
+    timer.lap('what_if')
+    result = {
+        "credit_score": int(scores['final_score'][0]),
+        "baseline": {**{name: float(value) for name, value in base.items()},
+                     "probability_of_default": float(scores['prob_default'][0])},
+        "axes": {name: scales[name] for name in RATIOS},
+        "surface": {
+            "credit_score": surface['final_score'].tolist(),
+            "probability_of_default": surface['prob_default'].tolist(),
+        },
+    }
+    timer.lap('format')
+    return result, timer
+
+# Per-customer running state for /get-score-incremental (one SQLite file, see feature_store.py)
+feature_store = FeatureStore()
+
+def score_incremental(customer_id: str, columns: dict, batch_seq: int = None):
+    """Fold new transactions into a customer's stored state and score the whole history.
+
+    Matches score_statements on every transaction sent so far for the customer,
+    without reading any of the earlier rows back. A `batch_seq` at or below the
+    last one applied is a retry: nothing is added and the current score returned.
+    """
+    timer = StageTimer()
+    models = model_registry.current()
+    df = frame_from_columns(columns)
+    timer.count('transactions', len(df))
+    timer.lap('frame')
+    df['date'] = parse_dates(df['date'])
+    timer.lap('dates')
+
+    def classify(descriptions, amounts, freqs):
+        rows = pd.DataFrame({'description': descriptions, 'amount': amounts})
+        return categorize_transactions(rows, freqs, models.nlp_model)
+
+    state, applied = feature_store.update(customer_id, df, classify, models.version, batch_seq)
+    timer.lap('state')
+    feats = to_features(state)
+    scores = score_features(feats, models.pd_model)
+    timer.lap('score')
+    payload = {"transactions_seen": state.n_rows, "batch_seq": state.last_batch_seq, "batch_applied": applied,
+               **build_payload(feats, scores, 0)}
+    timer.lap('format')
+    return payload, timer
+
+class StreamScorer:
+    """Scores one NDJSON statement fed in arbitrary byte chunks.
+
+    Rows are validated as they arrive and folded into a StatementStream every
+    STREAM_CHUNK_ROWS, so memory stays at about one chunk plus one entry per
+    distinct model-labelled description. The payload is the one /get-score
+    returns for the same rows.
+    """
+
+    def __init__(self, models: ModelSet, chunk_rows: int = STREAM_CHUNK_ROWS):
+        self.models = models
+        self.chunk_rows = chunk_rows
+        self.timer = StageTimer()
+        self.decoder = NDJSONDecoder(Transaction)
+        self.stream = StatementStream(lambda descriptions: keyword_labels(descriptions, models.nlp_model),
+                                      self._classify)
+        self.pending: List[Transaction] = []
+
+    def _classify(self, descriptions, amounts, freqs):
+        rows = pd.DataFrame({'description': descriptions, 'amount': amounts})
+        return categorize_transactions(rows, freqs, self.models.nlp_model)
+
+    def _fold(self, rows: List[Transaction]) -> None:
+        frame = pd.DataFrame({'description': [t.description for t in rows], 'amount': [t.amount for t in rows],
+                              'date': [t.date for t in rows]})
+        self.timer.lap('frame')
+        self.stream.add(frame, self.timer)
+
+    def feed(self, data: bytes) -> None:
+        self.pending += self.decoder.feed(data)
+        self.timer.lap('ingest')
+        while len(self.pending) >= self.chunk_rows:
+            rows, self.pending = self.pending[:self.chunk_rows], self.pending[self.chunk_rows:]
+            self._fold(rows)
+
+    def finish(self) -> dict:
+        self.pending += self.decoder.close()
+        self.timer.lap('ingest')
+        if self.pending:
+            self._fold(self.pending)
+            self.pending = []
+        if not self.stream.n_rows:
+            raise RequestValidationError([{'type': 'too_short', 'loc': ('body',),
+                                           'msg': "A statement needs at least 1 transaction", 'input': None}])
+        self.timer.count('transactions', self.stream.n_rows)
+        feats = self.stream.features(self.timer)
+        scores = score_features(feats, self.models.pd_model)
+        self.timer.lap('score')
+        payload = build_payload(feats, scores, 0)
+        self.timer.lap('format')
+        return payload
+
+# ==========================================
+# 4. MODEL REGISTRY
+# ==========================================
+WARMUP_STATEMENT = [
+    Transaction(description="NEFT BVP LTD SALARY", amount=60000, date="2025-01-01"),
+    Transaction(description="ANKIT", amount=-20, date="02/01/2025"),
+    Transaction(description="ATM WITHDRAWAL", amount=-2000, date="03 Jan 2025"),
+]
+
+def warm_up_models(models: ModelSet) -> None:
+    # Runs on every freshly loaded generation before it is swapped in: points
+    # the category cache at the new NLP model and pushes one statement through
+    # the full pipeline so the first real request pays no first-call costs
+    if models.nlp_model is not None:
+        category_cache.bind_model(models.nlp_model)
+    df = categorize_frame(build_frame([WARMUP_STATEMENT]), models)
+    score_features(aggregate_features(df), models.pd_model)
+
+# credit_brain.pkl (TF-IDF + RandomForest) or credit_brain_compact.npz, the
+# distilled hashing + linear model from compact_model.py (smaller, no pickle)
+NLP_MODEL_PATH = os.getenv('BHARATCRED_NLP_MODEL', 'credit_brain.pkl')
+
+model_registry = ModelRegistry(
+    {'nlp_model': NLP_MODEL_PATH, 'pd_model': 'pd_model.pkl'},
+    warmup=warm_up_models,
+)
+
+# ==========================================
+# 5. SCORING WORKERS
+# ==========================================
+def init_worker() -> None:
+    # Runs once in every worker process before it takes a job
+    model_registry.load()
+    model_registry.start_watching()
+
+def worker_status() -> dict:
+    # What the server knows of a worker: sent after its warm-up and with every job
+    return {"pid": os.getpid(), "model_version": model_registry.current().version,
+            "category_cache": category_cache.stats()}
+
+def worker_job(fn, *args):
+    # What a worker actually runs: fn(*args), with worker_status() sent back on
+    # its StageTimer, so a hot reload shows in /ready and cache counts in /cache-stats
+    result, timer = fn(*args)
+    timer.process_stats = worker_status()
+    return result, timer
+
+def local_models() -> ModelSet:
+    # For work that must stay in this process (streamed statements): a stream
+    # is folded as it arrives, so it cannot be handed to a worker in one job.
+    # With a worker pool the server holds no models until the first stream,
+    # which loads one full extra set here (the same memory as one more
+    # worker); load() then also picks up changed files, as the watcher would.
+    return model_registry.current() if scoring_pool.workers <= 0 else model_registry.load()
+
+# Worker pid -> its worker_status() as of its warm-up or the last job it returned
+worker_states = {}
+
+def record_workers(statuses: list) -> None:
+    # A fresh set of workers is warm (startup, or a crash replaced them all)
+    worker_states.clear()
+    for status in statuses:
+        record_worker(status)
+
+def record_worker(status: dict) -> None:
+    worker_states[str(status['pid'])] = status
+
+scoring_pool = ScoringPool(initializer=init_worker, on_ready=record_workers)
+
+@app.exception_handler(PoolUnavailable)
+async def pool_unavailable(request, exc: PoolUnavailable):
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail},
+                        headers={"Retry-After": str(exc.retry_after)})
+
+# ==========================================
+# 6. METRICS
+# ==========================================
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.add(Histogram(
+    'bharatcred_stage_seconds', 'Time per scoring stage', LATENCY_BUCKETS, ('endpoint', 'size', 'stage')))
+REQUEST_SECONDS = metrics.add(Histogram(
+    'bharatcred_request_seconds', 'Scoring request time from arrival to response body', LATENCY_BUCKETS,
+    ('endpoint', 'size')))
+REQUEST_TRANSACTIONS = metrics.add(Histogram(
+    'bharatcred_request_transactions', 'Transactions per scoring request', SIZE_BUCKETS, ('endpoint',)))
+KEYWORD_FRACTION = metrics.add(Histogram(
+    'bharatcred_keyword_fraction', 'Share of a request\'s rows labelled by keyword rules rather than the NLP model',
+    FRACTION_BUCKETS, ('endpoint',)))
+CLASSIFIED_ROWS = metrics.add(Counter(
+    'bharatcred_classified_rows_total', 'Rows labelled, by keyword rules or the NLP model', ('method',)))
+metrics.add(Gauge('bharatcred_scoring_in_flight', 'Scoring requests admitted and not yet done',
+                  lambda: scoring_pool.in_flight))
+metrics.add(Gauge('bharatcred_scoring_rejected_total', 'Scoring requests turned away with 429',
+                  lambda: scoring_pool.rejected, kind='counter'))
+metrics.add(Gauge('bharatcred_scoring_timed_out_total', 'Scoring requests answered with 503 after the timeout',
+                  lambda: scoring_pool.timed_out, kind='counter'))
+metrics.add(Gauge('bharatcred_result_cache_hits_total', 'Scoring requests answered from the result cache',
+                  lambda: result_cache.hits + result_cache.disk_hits, kind='counter'))
+metrics.add(Gauge('bharatcred_result_cache_misses_total', 'Result cache lookups that had to score',
+                  lambda: result_cache.misses, kind='counter'))
+
+def size_class(n_transactions: int) -> str:
+    # Coarse label so per-stage latency can be split by statement size
+    for bound, label in ((100, '<100'), (1000, '<1k'), (10000, '<10k')):
+        if n_transactions < bound:
+            return label
+    return '10k+'
+
+def record_request(endpoint: str, timer: StageTimer, received_at: float, dispatched_at: float,
+                   response: Response) -> None:
+    now = perf_counter()
+    worker_time = sum(timer.stages.values())
+    # ingest = body read + JSON + pydantic + columns; queue = waiting for a
+    # worker plus the hop to it and back
+    stages = {'ingest': dispatched_at - received_at, 'queue': max(0.0, now - dispatched_at - worker_time),
+              **timer.stages}
+    n = timer.counts.get('transactions', 0)
+    size = size_class(n)
+    for stage, seconds in stages.items():
+        STAGE_SECONDS.observe(seconds, endpoint, size, stage)
+    REQUEST_SECONDS.observe(now - received_at, endpoint, size)
+    REQUEST_TRANSACTIONS.observe(n, endpoint)
+    keyword_rows, model_rows = timer.counts.get('keyword_rows', 0), timer.counts.get('model_rows', 0)
+    if keyword_rows + model_rows:
+        KEYWORD_FRACTION.observe(keyword_rows / (keyword_rows + model_rows), endpoint)
+        CLASSIFIED_ROWS.inc(keyword_rows, 'keyword')
+        CLASSIFIED_ROWS.inc(model_rows, 'model')
+    if SERVER_TIMING:
+        response.headers['Server-Timing'] = server_timing(stages, timer.counts)
+
+async def run_scoring(endpoint: str, request: Request, response: Response, fn, *args):
+    # fn(*args) runs on the scoring pool and returns (result, StageTimer)
+    dispatched_at = perf_counter()
+    if scoring_pool.workers > 0:
+        result, timer = await scoring_pool.run(worker_job, fn, *args)
+        record_worker(timer.process_stats)
+    else:
+        result, timer = await scoring_pool.run(fn, *args)
+    record_request(endpoint, timer, request.state.received_at, dispatched_at, response)
+    return result
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# ==========================================
+# 7. RESULT CACHE
+# ==========================================
+# Identical statement + same model generation -> byte-identical response (result_cache.py)
+result_cache = ResultCache()
+
+# Modules whose code decides what a payload says, besides this one and the model files
+SCORING_MODULES = ('features', 'scoring', 'date_parser', 'keyword_engine', 'category_cache',
+                   'compact_model', 'columnar', 'result_cache')
+
+def scoring_fingerprint() -> str:
+    """Everything besides the model files that shapes a payload, hashed.
+
+    The keyword rules as loaded, the output-affecting settings and the source
+    of this module and SCORING_MODULES. Part of every result key, so a rules fix, a setting
+    change or a code deploy never serves responses computed before it, not
+    even from the SQLite file that outlives restarts.
+    """
+    digest = hashlib.blake2b(digest_size=6)
+    digest.update(json.dumps(keyword_matcher.rules, sort_keys=True).encode())
+    digest.update(json.dumps({'category_cache_sig_digits': CACHE_SIG_DIGITS}).encode())
+    for path in [__file__] + [sys.modules[name].__file__ for name in SCORING_MODULES]:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+SCORING_FINGERPRINT = scoring_fingerprint()
+
+def serving_model_version() -> str:
+    # The generation a request would be scored with now. In front of a worker
+    # pool this process never loads the models, so it reads the files' version.
+    if scoring_pool.workers > 0:
+        return model_registry.file_version()
+    return model_registry.current().version
+
+def if_none_match(request: Request) -> set:
+    header = request.headers.get('if-none-match', '')
+    return {tag.strip().removeprefix('W/') for tag in header.split(',')}
+
+async def run_cached_scoring(endpoint: str, request: Request, response: Response, columns: dict) -> Response:
+    """Score one statement unless this exact statement was scored recently.
+
+    A client that sends back the ETag it was given gets 304 when nothing
+    changed; scoring is a read-only query, so the GET semantics apply. Any
+    other repeat is served from the cache as the stored response body.
+
+    Only the in-memory lookup runs on the event loop. Hashing the statement
+    (tens of ms for a large one) and the optional SQLite lookup and store run
+    on threads, so neither can stall other requests or /health.
+    """
+    timer = StageTimer()
+    dispatched_at = perf_counter()
+    digest = await run_in_threadpool(payload_digest, columns)
+    key = result_key(digest, serving_model_version(), SCORING_FINGERPRINT)
+    not_modified = f'"{key}"' in if_none_match(request)
+    body = None if not_modified else result_cache.get_memory(key)
+    if body is None and not not_modified and result_cache.disk is not None:
+        body = await run_in_threadpool(result_cache.get_disk, key)
+    if not_modified or body is not None:
+        timer.count('transactions', len(columns['amount']))
+        timer.lap('result_cache')
+        record_request(endpoint, timer, request.state.received_at, dispatched_at, response)
+    else:
+        payloads, version = await run_scoring(endpoint, request, response, score_columns_versioned, columns)
+        # Keyed by the generation that actually scored it, which during a
+        # reload may not be the one looked up
+        key = result_key(digest, version, SCORING_FINGERPRINT)
+        body = JSONResponse(jsonable_encoder(payloads[0])).body
+        result_cache.put_memory(key, body)
+        if result_cache.disk is not None:
+            await run_in_threadpool(result_cache.disk.put, key, body)
+    headers = {**response.headers, 'ETag': f'"{key}"'}
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type='application/json', headers=headers)
+
+# ==========================================
+# 8. ROUTES
+# ==========================================
+# async: liveness is answered on the event loop itself, even if every
+# threadpool thread is busy (e.g. waiting on the result cache's SQLite file)
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+@app.get("/ready")
+def ready():
+    if scoring_pool.workers > 0:
+        if not scoring_pool.ready:
+            return JSONResponse(status_code=503, content={"status": "workers starting"})
+        # model_version: what each worker reported with its warm-up or last job.
+        # stream_model_version: the server's own set for /get-score-stream (null until first used)
+        versions = sorted({w['model_version'] for w in worker_states.values()})
+        return {"status": "ready", "model_version": versions, "scoring": scoring_pool.stats(),
+                "stream_model_version": model_registry.current().version if model_registry.ready else None}
+    models = model_registry.current()
+    if not model_registry.ready:
+        return JSONResponse(status_code=503, content={"status": "models not loaded"})
+    return {"status": "ready", "model_version": models.version, "reloads": model_registry.reloads,
+            "scoring": scoring_pool.stats()}
+
+# Scoring endpoints are async so the event loop only parses and dispatches;
+# the pandas/sklearn work runs on the scoring pool
+@app.post("/get-score")
+async def calculate_score(txns: Statement, request: Request, response: Response):
+    return await run_cached_scoring('/get-score', request, response, statement_columns([txns]))
+
+@app.post("/get-score-columns")
+async def calculate_score_columns(request: Request, response: Response):
+    # One statement as columns: JSON {"description": [...], "amount": [...], "date": [...]},
+    # text/csv or an Arrow IPC stream. Validated column by column, no per-row models.
+    try:
+        columns = parse_columns(await request.body(), request.headers.get('content-type'))
+    except UnsupportedFormat as e:
+        return JSONResponse(status_code=415, content={"detail": str(e)})
+    return await run_cached_scoring('/get-score-columns', request, response, columns)
+
+@app.post("/get-score-stream")
+async def calculate_score_stream(request: Request, response: Response):
+    # One statement as NDJSON, one transaction object per line. Folded in chunks
+    # as it arrives, so statement size does not decide peak memory.
+    media_type = (request.headers.get('content-type') or '').split(';')[0].strip().lower()
+    if media_type not in NDJSON_TYPES:
+        return JSONResponse(status_code=415, content={"detail": f"Expected one of {', '.join(NDJSON_TYPES)}"})
+    # Scored in this process, but admitted like pool work: a stream holds one
+    # of the pool's slots (429 when none is free) and, body upload included,
+    # must finish within BHARATCRED_SCORING_TIMEOUT_SECONDS (else 503)
+    async with scoring_pool.admitted():
+        dispatched_at = perf_counter()
+        payload, timer = await scoring_pool.within_timeout(score_stream(request))
+    record_request('/get-score-stream', timer, request.state.received_at, dispatched_at, response)
+    return payload
+
+async def score_stream(request: Request):
+    # Like the pool jobs, returns (payload, StageTimer)
+    scorer = StreamScorer(await run_in_threadpool(local_models))
+    async for data in request.stream():
+        if data:
+            await run_in_threadpool(scorer.feed, data)
+    return await run_in_threadpool(scorer.finish), scorer.timer
+
+@app.post("/get-score-batch")
+async def calculate_score_batch(statements: List[CustomerStatement], request: Request, response: Response):
+    if not statements:
+        return []
+    columns = statement_columns([s.transactions for s in statements])
+    payloads = await run_scoring('/get-score-batch', request, response, score_columns_timed, columns)
+    return [{"customer_id": s.customer_id, **p} for s, p in zip(statements, payloads)]
+
+@app.post("/get-score-incremental")
+async def calculate_score_incremental(statement: IncrementalStatement, request: Request, response: Response):
+    # Only the transactions since the last call; the score covers the full history.
+    # A 503 timeout may still commit the batch on its worker: batch_seq makes the
+    # client's retry (Retry-After) safe, as the replay is not counted twice
+    columns = statement_columns([statement.transactions])
+    payload = await run_scoring('/get-score-incremental', request, response, score_incremental,
+                                statement.customer_id, columns, statement.batch_seq)
+    return {"customer_id": statement.customer_id, **payload}
+
+@app.post("/get-score-what-if")
+async def calculate_score_what_if(what_if: WhatIfRequest, request: Request, response: Response):
+    # One statement plus multipliers per ratio; categorized once, every grid point scored together
+    columns = statement_columns([what_if.transactions])
+    return await run_scoring('/get-score-what-if', request, response, score_what_if, columns,
+                             what_if.scale.model_dump())
+
+@app.delete("/customer-state/{customer_id}")
+def delete_customer_state(customer_id: str):
+    # Forget a customer's history; their next incremental call starts from zero
+    return {"customer_id": customer_id, "deleted": feature_store.delete(customer_id)}
+
 if __name__ == "__main__":
     uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
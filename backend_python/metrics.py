@@ -0,0 +1,150 @@
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+# Per-request Server-Timing header (stage durations in ms); off by default
+# because it exposes internals to every client
+SERVER_TIMING = os.getenv('BHARATCRED_SERVER_TIMING', '0') == '1'
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+FRACTION_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+# ==========================================
+# 2. STAGE TIMER
+# ==========================================
+class StageTimer:
+    """Wall time per pipeline stage plus a few row counts for one request.
+
+    Stages are laps: lap('dates') charges everything since the previous lap
+    (or since creation) to 'dates'. One perf_counter call per stage, so it
+    stays on in production. Plain dicts, so it pickles back from a worker.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        # State of the process that ran the job, sent back with it (a worker's
+        # pid, model version and cache stats)
+        self.process_stats: Dict[str, object] = {}
+        self._mark = perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def count(self, name: str, n: int) -> None:
+        self.counts[name] = self.counts.get(name, 0) + int(n)
+
+def server_timing(stages: Dict[str, float], counts: Dict[str, int]) -> str:
+    """Server-Timing header value: one entry per stage in ms, counts as descriptions."""
+    parts = [f"{stage};dur={seconds * 1e3:.2f}" for stage, seconds in stages.items()]
+    parts += [f'{name};desc="{n}"' for name, n in counts.items()]
+    return ", ".join(parts)
+
+# ==========================================
+# 3. PROMETHEUS TEXT EXPOSITION
+# ==========================================
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{k}="{v}"' for k, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _num(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets, labels: Tuple[str, ...] = ()):
+        self.name, self.help, self.buckets, self.label_names = name, help, tuple(buckets), labels
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels) -> None:
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][slot] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: (list(v[0]), v[1], v[2]) for k, v in self._series.items()}
+        for labels, (counts, total, n) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets + (float('inf'),), counts):
+                cumulative += c
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{_num(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total!r}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {n}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name, self.help, self.label_names = name, help, labels
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines += [f"{self.name}{_labels(self.label_names, k)} {_num(v)}" for k, v in values]
+        return lines
+
+class Gauge:
+    """Read at scrape time from `read`, which returns a number.
+
+    kind='counter' is for totals some other object already keeps.
+    """
+
+    def __init__(self, name: str, help: str, read: Callable[[], float], kind: str = 'gauge'):
+        self.name, self.help, self.read, self.kind = name, help, read, kind
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}",
+                f"{self.name} {_num(self.read())}"]
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(line for m in self.metrics for line in m.render()) + "\n"
+
+# ==========================================
+# 4. REQUEST CLOCK
+# ==========================================
+class RequestClock:
+    """ASGI middleware stamping when a request arrived, before the body is read.
+
+    Handlers read request.state.received_at, so time spent receiving, parsing
+    and validating the body can be charged to a stage of its own.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            scope.setdefault('state', {})['received_at'] = perf_counter()
+        await self.app(scope, receive, send)
@@ -0,0 +1,116 @@
+"""Preconverted copies of the pickled model artifacts, for fast (re)starts.
+
+A pickle written by another scikit-learn/joblib version, or compressed,
+loads slowly: every estimator is version-checked (and warns) and nothing
+can be memory-mapped. Converting re-dumps it once, uncompressed, with the
+libraries installed here, into BHARATCRED_MODEL_CACHE_DIR. Later loads
+read that copy (arrays memory-mapped). A copy is keyed on the source
+file's path, mtime and size plus the library versions, so a new artifact
+or an upgrade simply misses and is converted again.
+
+Convert ahead of time (e.g. while building the image), from backend_python/:
+    python -m model_cache --cache-dir /var/cache/bharatcred credit_brain.pkl pd_model.pkl
+"""
+import argparse
+import glob
+import hashlib
+import os
+import platform
+import time
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
+
+import joblib
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+# '' = no cache: artifacts load straight from their source files
+MODEL_CACHE_DIR = os.getenv('BHARATCRED_MODEL_CACHE_DIR', '')
+
+LIBRARIES = ('scikit-learn', 'joblib', 'numpy', 'scipy')
+
+def _library_versions() -> str:
+    versions = [platform.python_version()]
+    for name in LIBRARIES:
+        try:
+            versions.append(f"{name}={version(name)}")
+        except PackageNotFoundError:
+            versions.append(f"{name}=none")
+    return ','.join(versions)
+
+# ==========================================
+# 2. CONVERTED COPIES
+# ==========================================
+def converted_path(path: str, cache_dir: str = MODEL_CACHE_DIR) -> str:
+    """Where the converted copy of `path` lives, as the files and libraries are now."""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{_library_versions()}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}.{digest}.joblib")
+
+def dump_atomic(model, path: str) -> None:
+    """joblib.dump to a staging file, then rename it over `path`.
+
+    Never truncates the old file, so a process still reading or mapping it
+    keeps the old contents and the model watcher never sees half a file.
+    """
+    staging = f"{path}.{os.getpid()}.staging"
+    try:
+        joblib.dump(model, staging)
+        os.replace(staging, path)
+    except BaseException:
+        if os.path.exists(staging):
+            os.remove(staging)
+        raise
+
+def convert(path: str, cache_dir: str = MODEL_CACHE_DIR, model=None) -> str:
+    """Write the converted copy of `path` (loading it unless `model` is given); returns its path."""
+    target = converted_path(path, cache_dir)
+    model = model if model is not None else joblib.load(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    dump_atomic(model, target)
+    # Copies for older versions of the same file are never read again
+    for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(os.path.basename(path))}.*.joblib")):
+        if stale != target:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return target
+
+def load(path: str, cache_dir: str = MODEL_CACHE_DIR, mmap_mode: Optional[str] = None):
+    """Load `path` through the cache: the converted copy if there is one, else convert on the way.
+
+    `mmap_mode` maps the converted copy only; the source file is always read
+    into memory, since whatever writes it may rewrite it in place.
+    """
+    target = converted_path(path, cache_dir)
+    if os.path.exists(target):
+        return joblib.load(target, mmap_mode=mmap_mode)
+    model = joblib.load(path)
+    try:
+        convert(path, cache_dir, model)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not write converted model for {path}. Error: {e}")
+        return model
+    return joblib.load(target, mmap_mode=mmap_mode) if mmap_mode else model
+
+# ==========================================
+# 3. CLI
+# ==========================================
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Preconvert pickled model artifacts for fast loading.")
+    parser.add_argument('paths', nargs='*', default=['credit_brain.pkl', 'pd_model.pkl'],
+                        help="pickled artifacts to convert (default: credit_brain.pkl pd_model.pkl)")
+    parser.add_argument('--cache-dir', default=MODEL_CACHE_DIR or '.model_cache',
+                        help="directory for the converted copies (default: $BHARATCRED_MODEL_CACHE_DIR or .model_cache)")
+    args = parser.parse_args(argv)
+    for path in args.paths:
+        t0 = time.perf_counter()
+        target = convert(path, args.cache_dir)
+        print(f"✅ {path} -> {target} ({time.perf_counter() - t0:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, NamedTuple, Optional
+
+import joblib
+
+import model_cache
+from compact_model import COMPACT_SUFFIX, CompactCategorizer
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+# joblib maps the numpy arrays of an uncompressed pickle straight from the file
+# when mmap_mode is set ('r'), so workers on one host share those pages through
+# the OS page cache instead of each holding a private copy. Off by default, and
+# only ever applied to model_cache's copies (BHARATCRED_MODEL_CACHE_DIR): a
+# mapped file rewritten in place (joblib.dump over credit_brain.pkl) changes
+# or vanishes under the live model, which then reads garbage or dies with a
+# bus error. The cache copies are private to the server and only ever replaced
+# by rename, so a mapping keeps the old file's pages.
+MODEL_MMAP_MODE = os.getenv('BHARATCRED_MODEL_MMAP', '') or None
+MODEL_POLL_SECONDS = float(os.getenv('BHARATCRED_MODEL_POLL_SECONDS', '5'))
+
+class ModelSet(NamedTuple):
+    """One consistent generation of artifacts; a request holds on to one."""
+    nlp_model: object
+    pd_model: object
+    version: str
+
+UNLOADED = ModelSet(None, None, 'unloaded')
+
+def load_artifact(path: str, mmap_mode: Optional[str] = MODEL_MMAP_MODE):
+    """One model file: a joblib pickle, or a compact_model .npz (arrays only, no pickle).
+
+    With BHARATCRED_MODEL_CACHE_DIR set, pickles load from their preconverted
+    copy there (see model_cache.py), memory-mapped if `mmap_mode` is set.
+    Without it they are read into memory: the source file is never mapped.
+    """
+    if path.endswith(COMPACT_SUFFIX):
+        return CompactCategorizer.load(path)
+    if model_cache.MODEL_CACHE_DIR:
+        return model_cache.load(path, model_cache.MODEL_CACHE_DIR, mmap_mode)
+    return joblib.load(path)
+
+# ==========================================
+# 2. REGISTRY
+# ==========================================
+class ModelRegistry:
+    """Loads the model artifacts once and swaps in new ones when the files change.
+
+    Loading is lazy: the first current() call (or an explicit load() at
+    startup) deserializes the files. A reload builds and warms a complete new
+    ModelSet off to the side and then replaces the reference in one
+    assignment, so in-flight requests finish on the generation they started
+    with and no request ever sees half-loaded models.
+    """
+
+    def __init__(self, paths: Dict[str, str], warmup: Optional[Callable[[ModelSet], None]] = None,
+                 mmap_mode: Optional[str] = MODEL_MMAP_MODE):
+        self.paths = paths
+        self.warmup = warmup
+        self.mmap_mode = mmap_mode
+        self._current: Optional[ModelSet] = None
+        self._stamp = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self.ready = False
+        self.reloads = 0
+
+    def _file_stamp(self):
+        try:
+            stats = [(p, os.stat(p)) for p in self.paths.values()]
+        except OSError:
+            return None
+        return tuple((p, st.st_mtime_ns, st.st_size) for p, st in stats)
+
+    @staticmethod
+    def _version(stamp) -> str:
+        return hashlib.sha1(repr(stamp).encode()).hexdigest()[:12]
+
+    def file_version(self) -> str:
+        """The version the files on disk load as, without loading them.
+
+        For processes that never load the models themselves (the server in
+        front of a worker pool); matches current().version once a reload lands.
+        """
+        return self._version(self._file_stamp())
+
+    def _load(self, stamp) -> ModelSet:
+        loaded = {name: load_artifact(path, self.mmap_mode) for name, path in self.paths.items()}
+        models = ModelSet(version=self._version(stamp), **loaded)
+        if self.warmup is not None:
+            self.warmup(models)
+        return models
+
+    def load(self) -> ModelSet:
+        """(Re)load if the files changed since the last load; returns the current set."""
+        with self._lock:
+            stamp = self._file_stamp()
+            if self._current is not None and stamp == self._stamp:
+                return self._current
+            try:
+                models = self._load(stamp)
+            except Exception as e:
+                # Keep serving the generation we have (or none) rather than a broken one;
+                # the watcher retries once the files change again
+                self._stamp = stamp
+                if self._current is None:
+                    print(f"⚠️ Warning: Model files not found! Error: {e}")
+                    self._current = UNLOADED
+                else:
+                    print(f"⚠️ Warning: Model reload failed, keeping {self._current.version}. Error: {e}")
+                return self._current
+            if self._current is not None and self._current is not UNLOADED:
+                self.reloads += 1
+            self._current, self._stamp = models, stamp
+            self.ready = True
+            return models
+
+    def current(self) -> ModelSet:
+        models = self._current
+        return models if models is not None else self.load()
+
+    # ---- hot reload ----
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            if self._file_stamp() != self._stamp:
+                self.load()
+
+    def start_watching(self, interval: float = MODEL_POLL_SECONDS) -> None:
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name='model-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
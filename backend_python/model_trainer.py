@@ -17,7 +17,8 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import StandardScaler
-import joblib
+from compact_model import distill
+from model_cache import dump_atomic
 
 # 1. THE NLP KNOWLEDGE BASE (Random Forest Training)
 # Trains the AI to understand Indian UPI context (Suresh, Ankit, etc.)
@@ -65,6 +66,13 @@ pd_model = LogisticRegression()
 pd_model.fit(pd_df[['savings', 'risk']], pd_df['target'])
 
 # 3. SAVE BOTH MODELS
-joblib.dump(nlp_clf, 'credit_brain.pkl')  # The NLP Detective
-joblib.dump(pd_model, 'pd_model.pkl')     # The Risk Judge
-print("✅ Full ML Pipeline Trained: NLP Detective + PD Judge (Corrected Logic)")
\ No newline at end of file
+# Staged then renamed over the old files: a running server keeps its loaded
+# models intact and its watcher swaps in the new ones on the next poll
+dump_atomic(nlp_clf, 'credit_brain.pkl')  # The NLP Detective
+dump_atomic(pd_model, 'pd_model.pkl')     # The Risk Judge
+print("✅ Full ML Pipeline Trained: NLP Detective + PD Judge (Corrected Logic)")
+
+# 4. COMPACT NLP DETECTIVE (hashing + linear, distilled from the forest above)
+# No pickle and a fraction of the size; serve it with BHARATCRED_NLP_MODEL=credit_brain_compact.npz
+distill(nlp_clf, df['text']).save('credit_brain_compact.npz')
+print("✅ Compact NLP Detective distilled -> credit_brain_compact.npz")
\ No newline at end of file
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+# Whole scoring responses for statements seen recently. A re-uploaded PDF or a
+# dashboard refresh posts the same transactions again; with the same model
+# generation the response cannot differ, so it is served from here.
+RESULT_CACHE_SIZE = int(os.getenv('BHARATCRED_RESULT_CACHE_SIZE', '1024'))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv('BHARATCRED_RESULT_CACHE_TTL_SECONDS', '900'))
+# Optional SQLite file behind the in-memory entries: survives restarts and is
+# shared by every server process on the host. Empty = memory only.
+RESULT_CACHE_PATH = os.getenv('BHARATCRED_RESULT_CACHE_PATH', '')
+
+def payload_digest(columns: dict) -> str:
+    """Hash of one request's transactions in canonical form.
+
+    Works on the parsed columns, so whitespace, key order, 1e3 vs 1000.0 and
+    JSON vs CSV vs Arrow uploads of the same statement all hash alike. Row
+    order is kept: it is part of the statement.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for name in ('description', 'date'):
+        values = columns[name]
+        values = values.tolist() if hasattr(values, 'tolist') else list(values)
+        # JSON-encoded so no two different lists hash the same bytes
+        digest.update(json.dumps(values, ensure_ascii=False).encode())
+    # + 0.0 folds -0.0 into 0.0
+    digest.update((np.asarray(columns['amount'], dtype=float) + 0.0).tobytes())
+    digest.update(np.asarray(columns['lengths'], dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+def result_key(digest: str, model_version: str, scoring_version: str = '') -> str:
+    # Also the response's ETag: a different model generation, or different
+    # rules/settings/code (scoring_version), is a different representation
+    return f"{model_version}.{scoring_version}-{digest}" if scoring_version else f"{model_version}-{digest}"
+
+# ==========================================
+# 2. DISK BACKING
+# ==========================================
+class DiskResults:
+    """Response bodies in one SQLite file, expired by wall-clock time."""
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS result_cache '
+                         '(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, body BLOB NOT NULL)')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """(age in seconds, body), or None when missing or expired."""
+        row = self._conn().execute('SELECT stored_at, body FROM result_cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        age = time.time() - row[0]
+        return (age, row[1]) if age < self.ttl_seconds else None
+
+    def put(self, key: str, body: bytes) -> None:
+        conn = self._conn()
+        now = time.time()
+        conn.execute('INSERT OR REPLACE INTO result_cache VALUES (?, ?, ?)', (key, now, body))
+        # Cheap with the file this small; keeps it bounded by the TTL
+        conn.execute('DELETE FROM result_cache WHERE stored_at < ?', (now - self.ttl_seconds,))
+
+    def clear(self) -> None:
+        self._conn().execute('DELETE FROM result_cache')
+
+# ==========================================
+# 3. BOUNDED TTL CACHE
+# ==========================================
+class ResultCache:
+    """LRU of result_key -> encoded response body, each entry living ttl_seconds.
+
+    Bodies are stored already JSON-encoded, so a hit costs one hash of the
+    payload and a dict lookup: no scoring pass and no re-serialization.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl_seconds: float = RESULT_CACHE_TTL_SECONDS,
+                 path: str = RESULT_CACHE_PATH):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk = DiskResults(path, ttl_seconds) if path and self.enabled else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    # The server calls the memory and disk halves separately: the in-memory
+    # LRU is a dict lookup and safe on the event loop, while SQLite can block
+    # on a file other processes are writing, so it runs on a thread.
+    def get(self, key: str) -> Optional[bytes]:
+        body = self.get_memory(key)
+        if body is None and self.disk is not None and self.enabled:
+            body = self.get_disk(key)
+        return body
+
+    def get_memory(self, key: str) -> Optional[bytes]:
+        """In-memory lookup only. A miss counts here unless a disk lookup follows."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            if self.disk is None:
+                self.misses += 1
+            return None
+
+    def get_disk(self, key: str) -> Optional[bytes]:
+        """Disk lookup after a get_memory miss (blocking); a hit is promoted to memory."""
+        found = self.disk.get(key)
+        with self._lock:
+            if found is None:
+                self.misses += 1
+                return None
+            # Promote with whatever lifetime the disk copy had left
+            age, body = found
+            self._insert(key, time.monotonic() + self.ttl_seconds - age, body)
+            self.disk_hits += 1
+            return body
+
+    def put(self, key: str, body: bytes) -> None:
+        self.put_memory(key, body)
+        if self.disk is not None:
+            self.disk.put(key, body)
+
+    def put_memory(self, key: str, body: bytes) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._insert(key, time.monotonic() + self.ttl_seconds, body)
+
+    def _insert(self, key: str, expires_at: float, body: bytes) -> None:
+        self._entries[key] = (expires_at, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk": self.disk.path if self.disk is not None else None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,83 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import expit
+
+# ==========================================
+# 1. COMPILED PD MODEL
+# ==========================================
+class PDScorer:
+    """Probability of default without going through sklearn per call.
+
+    For the binary LogisticRegression in pd_model.pkl the coefficients are
+    copied out once and predict_proba's own arithmetic is replayed on plain
+    arrays (the same matmul, then expit), so the numbers are bit-identical
+    but there is no input validation or estimator dispatch per call. Any
+    other estimator falls back to predict_proba. No model means PD = 0.5.
+    """
+
+    def __init__(self, pd_model):
+        self.model = pd_model
+        self.coef = None
+        self.intercept = None
+        if pd_model is not None and len(getattr(pd_model, 'classes_', ())) == 2 and hasattr(pd_model, 'coef_'):
+            self.coef = np.ascontiguousarray(np.asarray(pd_model.coef_, dtype=float).T)
+            self.intercept = np.asarray(pd_model.intercept_, dtype=float)
+
+    def prob_default(self, savings_rate: np.ndarray, risky_ratio: np.ndarray) -> np.ndarray:
+        shape = np.broadcast(savings_rate, risky_ratio).shape
+        if self.model is None:
+            return np.full(shape, 0.5)
+        X = np.column_stack([np.broadcast_to(savings_rate, shape).ravel(),
+                             np.broadcast_to(risky_ratio, shape).ravel()]).astype(float)
+        if self.coef is None:
+            return self.model.predict_proba(X)[:, 1].reshape(shape)
+        return expit((X @ self.coef + self.intercept).ravel()).reshape(shape)
+
+@lru_cache(maxsize=2)
+def compile_pd_model(pd_model) -> PDScorer:
+    # Keyed on the model object, so each loaded generation is compiled once
+    return PDScorer(pd_model)
+
+# ==========================================
+# 2. PD -> SCORE -> CAPACITY
+# ==========================================
+def score_ratios(scorer: PDScorer, avg_monthly_income, savings_rate, risky_ratio, cash_ratio) -> dict:
+    """Final score from the four behavioral ratios, elementwise over any shape.
+
+    Inputs broadcast against each other, so the same code scores N customers
+    or a grid of what-if variations of one customer.
+    """
+    avg_monthly_income, savings_rate, risky_ratio, cash_ratio = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (avg_monthly_income, savings_rate, risky_ratio, cash_ratio)))
+
+    # D. THE PD LAYER (LOGISTIC REGRESSION)
+    prob_default = scorer.prob_default(savings_rate, risky_ratio)
+    if scorer.model is not None:
+        # Blind-Spot Penalty: Increase risk probability if behavior is hidden in cash
+        prob_default = np.where(cash_ratio > 0.3,
+                                np.minimum(1.0, prob_default + (cash_ratio * 0.25)),
+                                prob_default)
+
+    # E. NATURAL SCALING
+    raw_ml_score = 350 + ((1 - prob_default) * 530)
+
+    # F. STABILITY-BOOSTED CAPACITY
+    has_avg = avg_monthly_income > 0
+    base_mult = 0.45 + (np.log10(np.where(has_avg, avg_monthly_income, 1.0)) / 11)
+    # Stability Bonus: Rewards 0% Risk + Elite Savings (40%+) + Transparency
+    elite = (risky_ratio == 0) & (savings_rate > 0.4) & (cash_ratio < 0.2)
+    stability_bonus = np.where(has_avg & elite, 0.06, 0.0)
+    capacity_multiplier = np.where(has_avg, np.minimum(base_mult + stability_bonus, 1.1), 0.45)
+
+    final_score = np.clip(np.trunc(raw_ml_score * capacity_multiplier), 300, 900).astype(int)
+    return {
+        'avg_monthly_income': avg_monthly_income,
+        'savings_rate': savings_rate,
+        'risky_ratio': risky_ratio,
+        'cash_ratio': cash_ratio,
+        'prob_default': prob_default,
+        'stability_bonus': stability_bonus,
+        'capacity_multiplier': capacity_multiplier,
+        'final_score': final_score,
+    }
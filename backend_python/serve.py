@@ -0,0 +1,103 @@
+"""Fast-start entry point: binds the port at once, loads the scoring app behind it.
+
+Importing main.py (pandas, scikit-learn, FastAPI) and loading and warming the
+models takes seconds, during which a plain `uvicorn main:app` has no port
+open and deploy-time health checks fail. This module imports only the
+standard library. Its app answers probes straight away and imports main in a
+background warm-up task; once that is done, every request goes to main.app.
+
+Run from backend_python/:  python serve.py   (or: uvicorn serve:app --port 8000)
+"""
+import asyncio
+import importlib
+import json
+import time
+from contextlib import AsyncExitStack
+from typing import Optional
+
+# ==========================================
+# 1. FAST-START APP
+# ==========================================
+class FastStart:
+    """ASGI app that answers liveness and readiness while `module` loads behind it.
+
+    Lifespan startup completes immediately and starts the warm-up: import
+    the module on a thread, load its models on a thread (so the event loop
+    keeps answering), then run the module's own lifespan. Until that is done
+    /health answers 200 and /ready and every other route 503 with
+    Retry-After. If the warm-up fails, /health turns 500 as well so the
+    orchestrator restarts the process. Afterwards all requests, probes
+    included, go straight to the module's app.
+    """
+
+    def __init__(self, module: str = 'main'):
+        self.module = module
+        self.target = None
+        self.error: Optional[str] = None
+        self.created_at = time.perf_counter()
+        self.ready_seconds: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lifespans = AsyncExitStack()
+
+    async def _warm_up(self) -> None:
+        try:
+            main = await asyncio.to_thread(importlib.import_module, self.module)
+            if main.scoring_pool.workers <= 0:
+                # main's lifespan would load on the event loop; done here, it finds the models loaded
+                await asyncio.to_thread(main.model_registry.load)
+            await self._lifespans.enter_async_context(main.app.router.lifespan_context(main.app))
+            self.target = main.app
+            self.ready_seconds = time.perf_counter() - self.created_at
+            print(f"✅ Scoring app ready {self.ready_seconds:.2f}s after start")
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Warning: Fast-start warm-up failed. Error: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._warm_up())
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self._task is not None:
+                    await asyncio.shield(self._task)
+                await self._lifespans.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if self.target is not None:
+            await self.target(scope, receive, send)
+            return
+        # Servers run without lifespan events still get the warm-up
+        self.start()
+        if scope['type'] != 'http':
+            await send({'type': 'websocket.close', 'code': 1013})
+            return
+        if self.error is not None:
+            status, body = 500 if scope['path'] == '/health' else 503, {"status": "failed", "error": self.error}
+        elif scope['path'] == '/health':
+            status, body = 200, {"status": "ok"}
+        else:
+            status, body = 503, {"status": "starting",
+                                 "seconds_since_start": round(time.perf_counter() - self.created_at, 3)}
+        data = json.dumps(body).encode()
+        headers = [(b'content-type', b'application/json'), (b'content-length', str(len(data)).encode())]
+        if status == 503:
+            headers.append((b'retry-after', b'1'))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': data})
+
+app = FastStart()
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -0,0 +1,189 @@
+import os
+from fractions import Fraction
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from category_cache import quantize
+from date_parser import parse_dates
+from features import BehavioralFeatures, cash_mask
+from metrics import StageTimer
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+# Rows decoded and folded at a time by /get-score-stream, and model groups
+# labelled at a time when it finishes
+STREAM_CHUNK_ROWS = int(os.getenv('BHARATCRED_STREAM_CHUNK_ROWS', '20000'))
+
+NON_POSITIVE_INCOME = 'Income<=0'
+
+# ==========================================
+# 2. EXACT SUMS
+# ==========================================
+# Every finite float is a whole number of 2**-1074, so sums kept as Python ints
+# in those units are exact; converting once at the end rounds them exactly as
+# math.fsum rounds the same values in aggregate_features.
+UNIT_BITS = 1074
+FAST_BITS = 72  # |x| >= 2**-20 is a whole number of 2**-72: one multiply, no Fraction
+
+def exact_units(values: np.ndarray) -> np.ndarray:
+    """Each finite float in `values` as an exact integer count of 2**-1074 (object array)."""
+    values = np.asarray(values, dtype=float)
+    scaled = values * 2.0 ** FAST_BITS
+    fast = np.isfinite(scaled) & (scaled == np.floor(scaled))
+    units = np.empty(len(values), dtype=object)
+    units[fast] = [int(s) << (UNIT_BITS - FAST_BITS) for s in scaled[fast].tolist()]
+    for i in np.flatnonzero(~fast):
+        n, d = float(values[i]).as_integer_ratio()
+        units[i] = n << (UNIT_BITS - d.bit_length() + 1)
+    return units
+
+def units_to_float(units: int) -> float:
+    return float(Fraction(units, 1 << UNIT_BITS))
+
+# ==========================================
+# 3. CHUNKED STATEMENT FOLD
+# ==========================================
+class StatementStream:
+    """One statement's BehavioralFeatures, built from chunks of rows in order.
+
+    Rows are never kept. Keyword-labelled rows (their label cannot depend on
+    how often the description repeats) go straight into per-category running
+    totals. Rows left to the NLP model are kept only as (description,
+    quantized amount) groups with a row count, exact sum and first row index,
+    and labelled once at the end with their description's final count. So
+    memory grows with the distinct descriptions the model has to label, not
+    with rows.
+
+    `keyword_labels(descriptions)` gives each row's fixed label (NaN when the
+    model decides); `classify(descriptions, amounts, freqs)` labels rows as
+    categorize_transactions does.
+    """
+
+    def __init__(self, keyword_labels: Callable, classify: Callable):
+        self.keyword_labels = keyword_labels
+        self.classify = classify
+        self.n_rows = 0
+        self.months = set()
+        # bucket -> [rows, sum |amount| in units, first row index]
+        self.buckets: Dict[str, list] = {}
+        self.keyword_rows = 0
+        self.cash_units = 0
+        # (description, quantized amount) -> [rows, sum |amount| in units, first row index, raw amount].
+        # Most model-labelled descriptions occur once (UPI references); a one-row
+        # group's sum stays None, as its amount already is its exact sum.
+        self.groups: Dict[Tuple[str, float], list] = {}
+        self.description_counts: Dict[str, int] = {}
+
+    def add(self, rows: pd.DataFrame, timer: StageTimer = None) -> None:
+        """Fold the next rows (description, amount and raw date columns) in."""
+        timer = timer if timer is not None else StageTimer()
+        n = len(rows)
+        if not n:
+            return
+        dates = parse_dates(rows['date'])
+        self.months.update(dates.dropna().to_numpy().astype('datetime64[M]').view(np.int64).tolist())
+        timer.lap('dates')
+
+        descriptions = rows['description']
+        amounts = rows['amount'].to_numpy(dtype=float)
+        index = np.arange(self.n_rows, self.n_rows + n)
+        units = exact_units(np.abs(amounts))
+        is_cash = cash_mask(descriptions)
+        if is_cash.any():
+            self.cash_units += sum(units[is_cash])
+
+        labels = np.asarray(self.keyword_labels(descriptions), dtype=object)
+        to_model = pd.isna(labels).astype(bool)
+        timer.count('keyword_rows', n - int(to_model.sum()))
+        timer.count('model_rows', int(to_model.sum()))
+        timer.lap('keywords')
+
+        fixed = np.flatnonzero(~to_model)
+        if len(fixed):
+            # Income is split by sign exactly as in aggregate_features
+            buckets = np.where((labels[fixed] == 'Income') & ~(amounts[fixed] > 0), NON_POSITIVE_INCOME,
+                               labels[fixed])
+            codes, names = pd.factorize(buckets)
+            for code, name in enumerate(names):
+                members = fixed[codes == code]
+                self._merge(self.buckets, name, len(members), sum(units[members]), int(index[members[0]]))
+            self.keyword_rows += len(fixed)
+
+        model = np.flatnonzero(to_model)
+        if len(model):
+            model_descriptions = descriptions.to_numpy()[model]
+            q = quantize(amounts[model])
+            codes, keys = pd.factorize(pd.MultiIndex.from_arrays([model_descriptions, q]))
+            order = np.argsort(codes, kind='stable')
+            starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0])
+            counts = np.diff(np.r_[starts, len(order)])
+            sums = np.add.reduceat(units[model][order], starts)
+            firsts = model[order[starts]]
+            for key, count, total, first in zip(keys.tolist(), counts.tolist(), sums.tolist(), firsts.tolist()):
+                group = self.groups.get(key)
+                if group is None:
+                    self.groups[key] = [count, total if count > 1 else None, int(index[first]), float(amounts[first])]
+                else:
+                    group[1] = self._group_units(group) + total
+                    group[0] += count
+            for description, count in pd.Series(model_descriptions).value_counts(sort=False).items():
+                self.description_counts[description] = self.description_counts.get(description, 0) + count
+        self.n_rows += n
+        timer.lap('state')
+
+    @staticmethod
+    def _merge(buckets: dict, name: str, rows: int, units: int, first: int) -> None:
+        bucket = buckets.get(name)
+        if bucket is None:
+            buckets[name] = [rows, units, first]
+        else:
+            bucket[0] += rows
+            bucket[1] += units
+            bucket[2] = min(bucket[2], first)
+
+    @staticmethod
+    def _group_units(group: list) -> int:
+        return group[1] if group[1] is not None else exact_units([abs(group[3])])[0]
+
+    def features(self, timer: StageTimer = None) -> BehavioralFeatures:
+        """Label the model groups with their final counts and read the totals off."""
+        timer = timer if timer is not None else StageTimer()
+        buckets = {name: list(bucket) for name, bucket in self.buckets.items()}
+        conf_units = self.keyword_rows << UNIT_BITS  # keyword labels have confidence 1.0
+        keys = list(self.groups)
+        for start in range(0, len(keys), STREAM_CHUNK_ROWS):
+            chunk = keys[start:start + STREAM_CHUNK_ROWS]
+            groups = [self.groups[key] for key in chunk]
+            descriptions = [description for description, _ in chunk]
+            cats, confs = self.classify(descriptions, np.array([g[3] for g in groups]),
+                                        np.array([self.description_counts[d] for d in descriptions]))
+            for group, cat, conf_units_one in zip(groups, cats, exact_units(confs)):
+                name = NON_POSITIVE_INCOME if cat == 'Income' and not group[3] > 0 else str(cat)
+                self._merge(buckets, name, group[0], self._group_units(group), group[2])
+                conf_units += conf_units_one * group[0]
+        timer.lap('nlp_model')
+
+        counts, first = {}, {}
+        for name, (rows, _, first_row) in buckets.items():
+            cat = 'Income' if name == NON_POSITIVE_INCOME else name
+            counts[cat] = counts.get(cat, 0) + rows
+            first[cat] = min(first.get(cat, first_row), first_row)
+        # Series.value_counts() order: count desc, ties by first appearance
+        ranked = sorted(counts, key=lambda c: (-counts[c], first[c]))
+        total = lambda name: np.array([units_to_float(buckets[name][1]) if name in buckets else 0.0])
+        feats = BehavioralFeatures(
+            total_income=total('Income'),
+            essential_spend=total('Essential'),
+            leisure_spend=total('Leisure'),
+            risky_spend=total('Risky'),
+            investment_spend=total('Investment'),
+            cash_withdrawn=np.array([units_to_float(self.cash_units)]),
+            valid_months=np.array([len(self.months)]),
+            conf_mean=np.array([units_to_float(conf_units)]) / self.n_rows,
+            category_distribution=[{c: counts[c] for c in ranked}],
+        )
+        timer.lap('aggregate')
+        return feats
@@ -0,0 +1,213 @@
+"""Streaming trainer for the NLP categorizer.
+
+Reads labelled transactions (CSV or Parquet, columns text or description,
+amount, label and optional freq) chunk by chunk, so memory is bounded by one chunk
+whatever the data size. Text is hashed (nothing to fit), the RandomForest
+grows by a few trees per chunk with those trees fitted in parallel across
+cores, and the compact linear model learns with partial_fit on the same
+chunks. Each run writes a versioned directory:
+
+    models/<version>/credit_brain.pkl
+    models/<version>/credit_brain_compact.npz
+    models/<version>/metadata.json      (data size, timings, params, checksums)
+
+--publish then swaps the new artifacts in next to main.py, where the model
+registry hot-reloads them.
+
+    python train_categorizer.py labelled.csv [more.parquet ...] --publish
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Iterator, List
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy import sparse
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+
+from category_cache import quantize
+from compact_model import SGD_ALPHA, CompactCategorizer, hashing_vectorizer, numeric_features, rows_per_column
+from features import CATEGORIES
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+CHUNK_ROWS = 200_000
+TREES_PER_CHUNK = 4
+MAX_DEPTH = 32
+MIN_SAMPLES_LEAF = 2
+ARTIFACTS = {'forest': 'credit_brain.pkl', 'compact': 'credit_brain_compact.npz'}
+
+# ==========================================
+# 2. STREAMING INPUT
+# ==========================================
+def read_chunks(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet input needs pyarrow installed")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        # keep_default_na=False: a merchant called "NA" is a description, not a missing value
+        yield from pd.read_csv(path, chunksize=chunk_rows, keep_default_na=False, na_values={'amount': ['']},
+                               dtype={'text': str, 'description': str, 'label': str})
+
+def clean_chunk(chunk: pd.DataFrame, classes: List[str]) -> pd.DataFrame:
+    """text/amount/freq/label rows the model can learn from, valued as serving sees them."""
+    chunk = chunk.rename(columns={'description': 'text'})
+    if 'freq' not in chunk:
+        chunk = chunk.assign(freq=1)
+    missing = {'text', 'amount', 'label'} - set(chunk.columns)
+    if missing:
+        raise SystemExit(f"Training data is missing column(s): {', '.join(sorted(missing))}")
+    chunk = chunk[chunk['label'].isin(classes) & chunk['amount'].notna()]
+    # The same amounts and frequencies main.py feeds the model (rounded only if
+    # BHARATCRED_CATEGORY_CACHE_SIG_DIGITS is set)
+    return pd.DataFrame({'text': chunk['text'].to_numpy(), 'amount': quantize(chunk['amount'].to_numpy()),
+                         'freq': quantize(chunk['freq'].to_numpy()), 'label': chunk['label'].to_numpy()})
+
+def with_every_class(X: sparse.csr_matrix, y: np.ndarray, classes: List[str]):
+    """Pad a chunk with one zero-weight row per class.
+
+    Every warm-started batch of trees must see the same classes_ or the forest
+    cannot average them; rows with weight 0 fix the label set without
+    influencing any split.
+    """
+    pad = sparse.csr_matrix((len(classes), X.shape[1]))
+    weights = np.concatenate([np.ones(len(y)), np.zeros(len(classes))])
+    return sparse.vstack([X, pad]).tocsr(), np.concatenate([y, classes]), weights
+
+# ==========================================
+# 3. TRAINING
+# ==========================================
+def train(paths: List[str], out_dir: str = 'models', chunk_rows: int = CHUNK_ROWS,
+          trees_per_chunk: int = TREES_PER_CHUNK, max_depth: int = MAX_DEPTH, n_jobs: int = -1,
+          classes: List[str] = CATEGORIES, seed: int = 42) -> str:
+    """Train both categorizers from `paths`; returns the new version directory."""
+    started = time.perf_counter()
+    classes = sorted(classes)
+    text = hashing_vectorizer()
+    # Hashing and passthrough have nothing to learn; fitting only records column names
+    preprocessor = ColumnTransformer([('text', text, 'text'), ('num', 'passthrough', ['amount', 'freq'])])
+    forest = RandomForestClassifier(n_estimators=0, warm_start=True, max_depth=max_depth,
+                                    min_samples_leaf=MIN_SAMPLES_LEAF, n_jobs=n_jobs, random_state=seed)
+    linear = SGDClassifier(loss='log_loss', alpha=SGD_ALPHA, random_state=seed)
+    column_rows = np.zeros(text.n_features, dtype=np.int64)
+    label_counts = dict.fromkeys(classes, 0)
+    rows = chunks = 0
+    timings = {'read': 0.0, 'forest': 0.0, 'compact': 0.0}
+
+    for path in paths:
+        mark = time.perf_counter()
+        for raw in read_chunks(path, chunk_rows):
+            chunk = clean_chunk(raw, classes)
+            if chunk.empty:
+                continue
+            if not chunks:
+                preprocessor.fit(chunk.iloc[:1])
+            hashed = text.transform(chunk['text'])
+            y = chunk['label'].to_numpy()
+            now = time.perf_counter()
+            timings['read'] += now - mark
+
+            # A few more trees, fitted on this chunk in parallel (n_jobs)
+            X = sparse.hstack([hashed, chunk[['amount', 'freq']].to_numpy()]).tocsr()
+            X, y_padded, weights = with_every_class(X, y, classes)
+            forest.n_estimators += trees_per_chunk
+            forest.fit(X, y_padded, sample_weight=weights)
+            mark = time.perf_counter()
+            timings['forest'] += mark - now
+
+            linear.partial_fit(sparse.hstack([hashed, numeric_features(chunk['amount'], chunk['freq'])]).tocsr(),
+                               y, classes=classes)
+            column_rows += rows_per_column(hashed)
+            now = time.perf_counter()
+            timings['compact'] += now - mark
+            mark = now
+
+            rows += len(chunk)
+            chunks += 1
+            for label, n in zip(*np.unique(y, return_counts=True)):
+                label_counts[label] += int(n)
+            print(f"  chunk {chunks}: {rows:,} rows, {forest.n_estimators} trees, "
+                  f"{time.perf_counter() - started:.0f}s")
+    if not rows:
+        raise SystemExit("No labelled rows to train on")
+
+    version = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    target = os.path.join(out_dir, version)
+    os.makedirs(target)
+    joblib.dump(Pipeline([('preprocessor', preprocessor), ('classifier', forest)]),
+                os.path.join(target, ARTIFACTS['forest']))
+    CompactCategorizer.from_linear(linear, column_rows).save(os.path.join(target, ARTIFACTS['compact']))
+
+    metadata = {
+        'version': version,
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'training_seconds': round(time.perf_counter() - started, 2),
+        'stage_seconds': {stage: round(t, 2) for stage, t in timings.items()},
+        'rows': rows,
+        'chunks': chunks,
+        'label_counts': label_counts,
+        'sources': [{'path': os.path.abspath(p), 'bytes': os.path.getsize(p)} for p in paths],
+        'params': {'chunk_rows': chunk_rows, 'trees_per_chunk': trees_per_chunk, 'n_estimators': forest.n_estimators,
+                   'max_depth': max_depth, 'min_samples_leaf': MIN_SAMPLES_LEAF, 'n_jobs': n_jobs,
+                   'n_text_features': text.n_features, 'sgd_alpha': SGD_ALPHA, 'seed': seed},
+        'libraries': {'scikit-learn': sklearn.__version__, 'numpy': np.__version__, 'pandas': pd.__version__},
+        'artifacts': {name: {'file': file, 'bytes': os.path.getsize(os.path.join(target, file)),
+                             'sha256': _sha256(os.path.join(target, file))}
+                      for name, file in ARTIFACTS.items()},
+    }
+    with open(os.path.join(target, 'metadata.json'), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return target
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def publish(version_dir: str, serving_dir: str = '.') -> None:
+    """Swap a version's artifacts in where main.py loads them.
+
+    Each file is copied next to its target and then renamed over it, so the
+    registry's watcher never sees a half-written model.
+    """
+    for file in ARTIFACTS.values():
+        staging = os.path.join(serving_dir, f'.{file}.staging')
+        shutil.copyfile(os.path.join(version_dir, file), staging)
+        os.replace(staging, os.path.join(serving_dir, file))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='labelled CSV / Parquet files')
+    parser.add_argument('--out', default='models', help='directory for versioned artifacts')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--trees-per-chunk', type=int, default=TREES_PER_CHUNK)
+    parser.add_argument('--max-depth', type=int, default=MAX_DEPTH)
+    parser.add_argument('--jobs', type=int, default=-1, help='cores for tree fitting (-1 = all)')
+    parser.add_argument('--publish', action='store_true', help='install the new artifacts for main.py')
+    args = parser.parse_args()
+
+    print(f"🧠 Training on {', '.join(args.paths)}")
+    version_dir = train(args.paths, args.out, args.chunk_rows, args.trees_per_chunk, args.max_depth, args.jobs)
+    with open(os.path.join(version_dir, 'metadata.json')) as f:
+        meta = json.load(f)
+    print(f"✅ {meta['rows']:,} rows in {meta['training_seconds']}s -> {version_dir}")
+    if args.publish:
+        publish(version_dir)
+        print("✅ Published; running servers pick the new models up on their next poll")
@@ -0,0 +1,41 @@
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from scoring import PDScorer, score_ratios
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+# Largest grid one /get-score-what-if request may ask for (product of the axis lengths)
+WHAT_IF_MAX_POINTS = int(os.getenv('BHARATCRED_WHAT_IF_MAX_POINTS', '10000'))
+
+# The score's inputs, in score_ratios' argument order; one grid axis each
+RATIOS = ('avg_monthly_income', 'savings_rate', 'risky_ratio', 'cash_ratio')
+# Shares of income or spend: scaling one up never takes it past 100%
+SHARES = ('savings_rate', 'risky_ratio')
+
+# ==========================================
+# 2. SCORE SURFACE
+# ==========================================
+def grid_points(scales: Dict[str, List[float]]) -> int:
+    return int(np.prod([len(scales.get(name, [1.0])) for name in RATIOS]))
+
+def score_surface(scorer: PDScorer, base: Dict[str, float], scales: Dict[str, List[float]]) -> dict:
+    """Score every combination of scaled ratios for one customer in one pass.
+
+    `base` holds the customer's own four ratios and `scales` a list of
+    multipliers per ratio (missing means [1.0]). Each axis becomes one
+    dimension of an open grid, so score_ratios broadcasts them into the full
+    surface: axis k of every returned array follows RATIOS[k]. The point
+    where every multiplier is 1.0 is exactly the customer's /get-score.
+    """
+    axes = []
+    for k, name in enumerate(RATIOS):
+        factors = np.asarray(scales.get(name, [1.0]), dtype=float)
+        shape = [1] * len(RATIOS)
+        shape[k] = len(factors)
+        values = base[name] * factors.reshape(shape)
+        axes.append(np.minimum(values, 1.0) if name in SHARES else values)
+    return score_ratios(scorer, *axes)
@@ -0,0 +1,169 @@
+import asyncio
+import multiprocessing
+import os
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+# ==========================================
+# 1. CONFIG
+# ==========================================
+# 0 keeps scoring in this process on the threadpool (the GIL serializes it);
+# N > 0 runs it on N worker processes that each load their own models.
+SCORING_WORKERS = int(os.getenv('BHARATCRED_SCORING_WORKERS', '0'))
+# Requests allowed to wait for a busy worker; beyond that we answer 429
+SCORING_QUEUE = int(os.getenv('BHARATCRED_SCORING_QUEUE', '32'))
+# A request that waited this long (queue + scoring) gets a 503
+SCORING_TIMEOUT_SECONDS = float(os.getenv('BHARATCRED_SCORING_TIMEOUT_SECONDS', '30'))
+
+def _init_worker(initializer: Optional[Callable], barrier) -> None:
+    # Every worker of a set loads before any takes a job, so once a warm-up job
+    # returns all of them are warm, whichever worker happened to run it
+    if initializer is not None:
+        initializer()
+    barrier.wait()
+
+class PoolUnavailable(Exception):
+    """Scoring was refused or abandoned; `status_code` is what the client should see."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+# ==========================================
+# 2. POOL WITH ADMISSION CONTROL
+# ==========================================
+class ScoringPool:
+    """Runs CPU-bound scoring off the event loop, with a bounded queue.
+
+    At most `workers + queue` requests are admitted at once (`1 + queue` in
+    threadpool mode); the next one is turned away with 429 straight away
+    instead of queuing without limit. An admitted request that is not done
+    within `timeout` seconds gets a 503. Work that has to stay in the server
+    process (streamed statements) takes a slot through admitted() and
+    within_timeout(), under the same limits. Worker processes run `initializer`
+    (model load + warm-up) before their first job, and start() spawns all of
+    them up front so no request waits for a cold worker. If a worker dies the
+    whole set is replaced the same way, answering 503 until it is warm again.
+    """
+
+    def __init__(self, workers: int = SCORING_WORKERS, queue: int = SCORING_QUEUE,
+                 timeout: float = SCORING_TIMEOUT_SECONDS, initializer: Optional[Callable] = None,
+                 on_ready: Optional[Callable[[list], None]] = None):
+        self.workers = workers
+        self.capacity = max(workers, 1) + queue
+        self.timeout = timeout
+        self.initializer = initializer
+        # Called with the warm-up results each time a fresh set of workers is
+        # ready: at start() and after a crash replaced them all
+        self.on_ready = on_ready
+        self._warmup: Optional[Callable] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._restarting: Optional[asyncio.Task] = None
+        # Only touched from the event loop thread, so no lock needed
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.restarts = 0
+        self.ready = workers <= 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the parent already runs threads (event loop, model watcher)
+        context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                   initargs=(self.initializer, context.Barrier(self.workers)), mp_context=context)
+
+    async def start(self, warmup: Callable) -> list:
+        """Spawn every worker and run `warmup` once on each; returns their results."""
+        if self.workers <= 0:
+            return []
+        self._warmup = warmup
+        return await self._spawn()
+
+    async def _spawn(self) -> list:
+        self.ready = False
+        self._executor = self._new_executor()
+        loop = asyncio.get_running_loop()
+        # No worker is idle yet, so each submit spawns a process of its own
+        results = await asyncio.gather(*(loop.run_in_executor(self._executor, self._warmup)
+                                         for _ in range(self.workers)))
+        self.ready = True
+        if self.on_ready is not None:
+            self.on_ready(results)
+        return results
+
+    def _restart(self) -> None:
+        # Requests get 503 (admitted() checks ready) until the new set is warm;
+        # cleared here, not in the task, so none slips in before it runs
+        self.restarts += 1
+        self.ready = False
+        self.shutdown(wait=False)
+        self._restarting = asyncio.get_running_loop().create_task(self._respawn())
+
+    async def _respawn(self) -> None:
+        try:
+            await self._spawn()
+        except Exception as e:
+            # Stays not ready: /ready answers 503 and the orchestrator restarts us
+            print(f"⚠️ Warning: Could not restart scoring workers. Error: {e}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._restarting is not None and not self._restarting.done():
+            self._restarting.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    @asynccontextmanager
+    async def admitted(self):
+        """Holds one of the `capacity` slots for the body of the block, or refuses."""
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PoolUnavailable(429, "Scoring queue is full, retry shortly")
+        if not self.ready:
+            raise PoolUnavailable(503, "Scoring workers are still starting")
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    async def within_timeout(self, job):
+        try:
+            return await asyncio.wait_for(job, self.timeout)
+        except asyncio.TimeoutError:
+            # The worker still finishes the job; only this request gives up on it
+            self.timed_out += 1
+            raise PoolUnavailable(503, f"Scoring did not finish within {self.timeout:g}s")
+
+    async def run(self, fn: Callable, *args):
+        async with self.admitted():
+            executor = self._executor
+            if executor is None:
+                job = run_in_threadpool(fn, *args)
+            else:
+                job = asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+            try:
+                return await self.within_timeout(job)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace and warm the pool for the
+                # next requests. Every job on the broken pool fails: restart once
+                if executor is self._executor:
+                    self._restart()
+                raise PoolUnavailable(503, "A scoring worker crashed, retry shortly")
+
+    def stats(self) -> dict:
+        return {
+            "mode": "processes" if self.workers > 0 else "threads",
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "restarts": self.restarts,
+        }